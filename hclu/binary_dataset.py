@@ -0,0 +1,201 @@
+"""
+This file is part of hclu.
+
+hclu is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+hclu is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with hclu.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""This module contains the binary dataset."""
+
+import collections
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from csv_loader import CsvLoader
+from data_file import DataFile
+from hclu_exception import HcluException
+
+# \file binary_dataset.py
+# \brief Directory with a CSV file converted into memory-mappable .npy
+#        files, one per column. Every column is stored as string array,
+#        numeric columns additionally as float64 array. meta.json holds
+#        the header, the column files and the size and modification time
+#        of the CSV file, the copy is stale if they changed.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+class BinaryDataset(object):
+    """Directory with a CSV file converted into .npy files."""
+
+    version = 1
+    meta_name = 'meta.json'
+
+    # \brief Initialize the dataset in the given directory.
+    def __init__(self, directory):
+        """Initialize the dataset in the given directory."""
+
+        self.directory = directory
+        self.meta = None
+
+    # \brief Returns if path is the directory of a binary dataset.
+    @classmethod
+    def is_dataset(cls, path):
+        """Returns if path is the directory of a binary dataset."""
+
+        return os.path.isfile(os.path.join(path, cls.meta_name))
+
+    # \brief Converts the CSV file filename into a binary dataset in the
+    #        given directory, by default filename.hclu. An existing
+    #        dataset in the directory is replaced.
+    @classmethod
+    def create(cls, filename, directory=None):
+        """Converts the CSV file filename into a binary dataset."""
+
+        if (directory is None):
+            directory = filename + '.hclu'
+
+        header, matrix, columns = CsvLoader().read(filename, [])
+
+        if (len(set(header)) != len(header)):
+            raise HcluException("attribute names are not unique")
+
+        status = os.stat(filename)
+        meta = {
+            'version': cls.version,
+            'source': os.path.abspath(filename),
+            'source_size': status.st_size,
+            'source_mtime': status.st_mtime,
+            'header': header,
+            'rows': len(matrix),
+            'strings': [],
+            'numbers': []}
+
+        # Written to a temporary directory first, which replaces the
+        # dataset at the end
+        parent = os.path.dirname(os.path.abspath(directory))
+        temporary = tempfile.mkdtemp(prefix='hclu-', dir=parent)
+
+        try:
+            for index, name in enumerate(header):
+                strings = columns[name]
+                meta['strings'].append('strings-%d.npy' % index)
+                np.save(os.path.join(temporary, meta['strings'][-1]), strings)
+
+                try:
+                    numbers = strings.astype(np.float64)
+                except ValueError:
+                    meta['numbers'].append(None)
+                    continue
+
+                meta['numbers'].append('numbers-%d.npy' % index)
+                np.save(os.path.join(temporary, meta['numbers'][-1]), numbers)
+
+            with open(os.path.join(temporary, cls.meta_name), 'w') as meta_file:
+                json.dump(meta, meta_file, indent=1)
+
+            if (os.path.isdir(directory)):
+                shutil.rmtree(directory)
+            os.rename(temporary, directory)
+        except:
+            shutil.rmtree(temporary, ignore_errors=True)
+            raise
+
+        return cls(directory)
+
+    # \brief Returns the dataset of the CSV file filename in the given
+    #        directory, by default filename.hclu. The dataset is created
+    #        if it does not exist or is stale.
+    @classmethod
+    def of(cls, filename, directory=None):
+        """Returns the up to date dataset of the CSV file filename."""
+
+        if (directory is None):
+            directory = filename + '.hclu'
+
+        dataset = cls(directory)
+        if (cls.is_dataset(directory) and not dataset.is_stale()):
+            return dataset
+
+        return cls.create(filename, directory)
+
+    # \brief Returns the content of meta.json.
+    def read_meta(self):
+        """Returns the content of meta.json."""
+
+        if (self.meta is None):
+            with open(os.path.join(self.directory, self.meta_name)) as meta_file:
+                self.meta = json.load(meta_file)
+
+            if (self.meta['version'] != self.version):
+                raise HcluException("unknown version of dataset " +
+                    self.directory)
+
+        return self.meta
+
+    # \brief Returns if the CSV file changed since the conversion. If it
+    #        does not exist any more, the dataset is up to date.
+    def is_stale(self):
+        """Returns if the CSV file changed since the conversion."""
+
+        try:
+            meta = self.read_meta()
+        except (IOError, ValueError, KeyError, HcluException):
+            return True
+
+        try:
+            status = os.stat(meta['source'])
+        except OSError:
+            return False
+
+        return (status.st_size != meta['source_size'] or
+            status.st_mtime != meta['source_mtime'])
+
+    # \brief Returns the DataFile of the dataset clustering the columns
+    #        with the given indices. The feature matrix is copied from the
+    #        memory-mapped columns, the other columns stay memory-mapped.
+    # \throw HcluException { throws if an attribute is not numeric. }
+    def load(self, cluster_indices, filename=None):
+        """Returns the DataFile of the dataset."""
+
+        meta = self.read_meta()
+        header = meta['header']
+
+        features = sorted(set(cluster_indices))
+        if (len(features) == 0 or features[0] < 0 or
+            features[-1] >= len(header)):
+            raise HcluException("attribute indices out of range")
+
+        matrix = np.empty((meta['rows'], len(features)), dtype=np.float64)
+        for j, index in enumerate(features):
+            if (meta['numbers'][index] is None):
+                raise HcluException("attribute " + 
+                    header[index].encode('utf-8') + " is not numeric")
+            matrix[:, j] = self._column(meta['numbers'][index])
+
+        columns = collections.OrderedDict(
+            (name.encode('utf-8'), self._column(meta['strings'][index]))
+            for index, name in enumerate(header) if index not in features)
+
+        data_file = DataFile()
+        data_file.filename = filename or meta['source'].encode('utf-8')
+        data_file.attributes = [name.encode('utf-8') for name in header]
+        data_file.cluster_indices = list(cluster_indices)
+        data_file.set_data(matrix, columns)
+
+        return data_file
+
+    # \brief Returns the column stored in the given file memory-mapped.
+    def _column(self, name):
+        return np.load(os.path.join(self.directory, name), mmap_mode='r')
@@ -0,0 +1,95 @@
+"""
+This file is part of hclu.
+
+hclu is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+hclu is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with hclu.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""This module contains the reader of bzip2 files."""
+
+import bz2
+import io
+
+# \file bzip2_file.py
+# \brief Raw reader of bzip2 compressed files with several streams, as
+#        written by pbzip2, lbzip2 or by concatenating .bz2 files.
+#        bz2.BZ2File of Python 2 stops silently after the first stream,
+#        here a new decompressor is started on the data following each
+#        stream until the end of the file. Meant to be wrapped in an
+#        io.BufferedReader.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+class Bzip2File(io.RawIOBase):
+    """Raw reader of bzip2 compressed files with several streams."""
+
+    read_size = 2 ** 16
+
+    # \brief Opens filename for reading.
+    def __init__(self, filename):
+        """Opens filename for reading."""
+
+        super(Bzip2File, self).__init__()
+
+        self.raw_file = open(filename, 'rb')
+        self.decompressor = bz2.BZ2Decompressor()
+
+        # Decompressed data not read yet
+        self.pending = ''
+        self.offset = 0
+
+    def readable(self):
+        return True
+
+    # \brief Reads decompressed data into buffer, returns the number of
+    #        bytes read, 0 at the end of the file.
+    # \throw IOError { throws if the file contains invalid data. }
+    def readinto(self, buffer):
+        """Reads decompressed data into buffer."""
+
+        while (self.offset == len(self.pending)):
+            data = self.raw_file.read(self.read_size)
+            if (len(data) == 0):
+                return 0
+
+            self.pending = self._decompress(data)
+            self.offset = 0
+
+        size = min(len(buffer), len(self.pending) - self.offset)
+        buffer[:size] = self.pending[self.offset:self.offset + size]
+        self.offset += size
+
+        return size
+
+    # \brief Returns the decompressed data, starts a new decompressor at
+    #        the end of each stream.
+    def _decompress(self, data):
+        parts = []
+
+        while (len(data) > 0):
+            try:
+                parts.append(self.decompressor.decompress(data))
+            except EOFError:
+                # The last stream ended exactly at the end of the last read
+                self.decompressor = bz2.BZ2Decompressor()
+                continue
+
+            data = self.decompressor.unused_data
+            if (len(data) > 0):
+                self.decompressor = bz2.BZ2Decompressor()
+
+        return ''.join(parts)
+
+    def close(self):
+        if (not self.closed):
+            self.raw_file.close()
+
+        super(Bzip2File, self).close()
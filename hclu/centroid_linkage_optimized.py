@@ -15,21 +15,25 @@ You should have received a copy of the GNU General Public License
 along with hclu.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from c_record import CRecord
+import numpy
+
 from strategy import Strategy
-from operator import mul
-import copy
 
-# \file single_linkage_naive.py
-# \brief Optimized naive Centroid-Linkage Implementation.
+# \file centroid_linkage_optimized.py
+# \brief Optimized Centroid-Linkage Implementation. Every cluster is
+#        represented by the running sum of its element vectors and its
+#        count, the distance between two clusters is the distance between
+#        their centroids. The nearest neighbour of every cluster is cached,
+#        after a merge the distances of the new centroid to all others are
+#        computed in one vectorized step. No distance matrix is stored.
 # \author Bjoern Borgmann <bjoern.borgmann@uni-oldenburg.de>
 class CentroidLinkageOptimized(Strategy):
     '''
-    Optimized naive Centroid-Linkage Implementation
+    Optimized Centroid-Linkage Implementation
     '''
     
     #Strategy Description
-    description = "Optimized naive Centroid-Linkage Implementation"
+    description = "Optimized Centroid-Linkage Implementation"
 
     # \brief Initialize the Alogrithm
     # \author Bjoern Borgmann <bjoern.borgmann@uni-oldenburg.de>
@@ -41,32 +45,20 @@ class CentroidLinkageOptimized(Strategy):
         # Calling super Constructor
         super(CentroidLinkageOptimized, self).initialize(data)
         
-        # Counting Elements. Building c_matrix and complete c_matrix
+        # Counting Elements. Running centroid sums and counts
         self.num_of_rec = len(data)
-        self.c_matrix = {}
-        self.complete_c_matrix = {}
+        self.centroid_sums = self.data_matrix(data)
+        self.counts = numpy.ones(self.num_of_rec)
+        self.centroids = self.centroid_sums.copy()
+        self.active = numpy.ones(self.num_of_rec, dtype=bool)
         
-        for i in xrange(self.num_of_rec):
-            self.c_matrix[i] = {}
-            self.complete_c_matrix[i] = {}
+        # Nearest neighbour and its distance of each cluster
+        self.nn_index = numpy.zeros(self.num_of_rec, dtype=numpy.int64)
+        self.nn_dist = numpy.empty(self.num_of_rec)
+        self.nn_dist.fill(numpy.inf)
         
-        for n in xrange(self.num_of_rec):
-            for i in xrange(n+1):
-                sim = self.distance_function.distance(data[n].data, data[i].data)
-                
-                tmp_record = CRecord(i,sim)
-                tmp_record2 = CRecord(i,sim)
-                self.c_matrix[n][i] = tmp_record
-                self.complete_c_matrix[n][i] = tmp_record2
-
-                tmp_record = CRecord(n,sim)
-                tmp_record2 = CRecord(i,sim)
-                self.c_matrix[i][n] = tmp_record
-                self.complete_c_matrix[i][n] = tmp_record2    
-                            
-        self.cluster_index_lists = {}
         for i in xrange(self.num_of_rec):
-            self.cluster_index_lists[i]=[i]
+            self._update_nearest(i, self._distances(i))
                 
     def run(self):
         '''
@@ -75,48 +67,56 @@ class CentroidLinkageOptimized(Strategy):
         
         for n in xrange(self.num_of_rec-1):
             # Searching next best
-            best = None
-            i1 = None
-            for i, sub_matrix in self.c_matrix.iteritems():
-                for c_record in sub_matrix.itervalues():
-                    if (c_record.index != i and \
-                        (best == None or best.sim > c_record.sim)):
-                            best = c_record
-                            i1 = i
+            i1 = int(numpy.argmin(self.nn_dist))
+            i2 = int(self.nn_index[i1])
                     
             # Merge
-            self.new_level(i1, best.index, best.sim)
-
-            for i in self.c_matrix[i1].iterkeys():
-                # No Sim for new cluster with his self
-                if i != i1 and i != best.index:
-                    # Calculate the number of the sims between both cluster before
-                    # the new Merge. (Fakultaet fuer anzahl elemente minus 1)
-                    #num_of_sims = \
-                    #    reduce(mul, xrange(2, len(self.cluster_index_lists[i1])+len(self.cluster_index_lists[i])), 1)
-                    num_of_sims = 0
-                    
-                    # Init current value
-                    #curr_value = self.c_matrix[i1][i]*num_of_sims
-                    curr_value = 0
-                    
-                    for ind1 in self.cluster_index_lists[i1]:
-                        for ind2 in self.cluster_index_lists[i]:
-                            curr_value+=\
-                                self.complete_c_matrix[ind1][ind2].sim
-                            num_of_sims += 1
-                    
-                    # New Sim
-                    new_sim = curr_value / num_of_sims
-                    
-                    self.c_matrix[i1][i].sim = new_sim
-                    self.c_matrix[i][i1].sim = new_sim
-                    
-            # Update Cluster Index List
-            self.cluster_index_lists[i1].append(best.index)
-            #del(self.cluster_index_lists[best.index])
+            self.new_level(i1, i2, float(self.nn_dist[i1]))
+            
+            # Update centroid of i1, delete i2
+            self.centroid_sums[i1] += self.centroid_sums[i2]
+            self.counts[i1] += self.counts[i2]
+            self.centroids[i1] = self.centroid_sums[i1] / self.counts[i1]
+            
+            self.active[i2] = False
+            self.nn_dist[i2] = numpy.inf
             
-            # Delete merged Cluster
-            del(self.c_matrix[best.index])
-            for sub_matrix in self.c_matrix.itervalues():
-                del(sub_matrix[best.index])
+            # New Sims of the new centroid to all others
+            sims = self._distances(i1)
+            self._update_nearest(i1, sims)
+            
+            # Clusters with one of the merged clusters as nearest neighbour
+            # are searched again, all others can only get closer.
+            stale = self.active & (
+                (self.nn_index == i1) | (self.nn_index == i2))
+            stale[i1] = False
+            
+            closer = self.active & ~stale & (sims < self.nn_dist)
+            self.nn_dist[closer] = sims[closer]
+            self.nn_index[closer] = i1
+            
+            for i in numpy.flatnonzero(stale):
+                self._update_nearest(i, self._distances(i))
+    
+    # \brief Returns the distances of the centroid of cluster i to all 
+    #        centroids, infinite for i itself and merged clusters.
+    def _distances(self, i):
+        '''
+        Returns the distances of the centroid of cluster i to all others
+        '''
+        
+        sims = self.distance_function.cdist(
+            self.centroids[i:i+1], self.centroids)[0]
+        sims[~self.active] = numpy.inf
+        sims[i] = numpy.inf
+        
+        return sims
+    
+    # \brief Sets the nearest neighbour of cluster i from its distances
+    def _update_nearest(self, i, sims):
+        '''
+        Sets the nearest neighbour of cluster i from its distances
+        '''
+        
+        self.nn_index[i] = numpy.argmin(sims)
+        self.nn_dist[i] = sims[self.nn_index[i]]
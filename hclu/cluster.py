@@ -25,7 +25,12 @@ from data_element import DataElement
 # \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de> 
 class Cluster(object):
 
+    # Clusters are created for every merge, slots keep them small
+    __slots__ = ('c1', 'c2', 'element', 'sim', 'size')
+
     # \brief Initialize cluster with optionally children and simialarity.
+    #        Merging costs O(1), the data elements are not copied but 
+    #        found through the children on demand.
     # \author Bjoern Borgmann <bjoern.borgmann@uni-oldenburg.de>
     # \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
     def __init__(self, c1, c2 = None, sim = None):
@@ -36,18 +41,22 @@ class Cluster(object):
         self.c1 = None
         self.c2 = None
         
-        # All data elements in the cluster.
-        self.elements = []
+        # Data element of a leaf cluster.
+        self.element = None
+        
+        # Simialarity of the children, None for leaf clusters.
+        self.sim = None
 
         # Determine if cluster of clusters or leaf cluster with one DataElement
         if (isinstance(c1, DataElement) and c2 == None and sim == None):
             # Initialize with Data Element
-            self.elements.append(c1)
+            self.element = c1
+            self.size = 1
         elif (isinstance(c1, Cluster) and isinstance(c2, Cluster)):
             self.c1 = c1
             self.c2 = c2
             
-            self.elements = c1.elements + c2.elements
+            self.size = c1.size + c2.size
             
             # Check if sim is available.
             if (sim != None):
@@ -59,3 +68,30 @@ class Cluster(object):
                 "Constructor of Cluster need one DataElement Objects and " + 
                 "nothing or two Cluster Objects and a float sim " + 
                 "value if avaible")
+
+    # \brief All data elements in the cluster as list, in the order of the 
+    #        leaves from c1 to c2.
+    # \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+    @property
+    def elements(self):
+        """All data elements in the cluster as list."""
+        return list(self.leaves())
+
+    # \brief Generates the data elements in the cluster. The tree is walked
+    #        with an explicit stack, as it may be deeper than the 
+    #        recursion limit.
+    # \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+    def leaves(self):
+        """Generates the data elements in the cluster."""
+
+        stack = [self]
+        while stack:
+            cluster = stack.pop()
+            if (cluster.element is not None):
+                yield cluster.element
+            else:
+                stack.append(cluster.c2)
+                stack.append(cluster.c1)
+
+    def __len__(self):
+        return self.size
@@ -14,6 +14,10 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with hclu.  If not, see <http://www.gnu.org/licenses/>.
 """
+
+from cut import cut
+from hclu_exception import HcluException
+from level_view import LevelView
        
 # \file hclu.py
 # \brief Class representing one clustering run
@@ -32,7 +36,9 @@ class ClusteringRun(object):
                  run_start_time,
                  end_time,
                  seconds_needed,
-                 clustering
+                 linkage,
+                 elements,
+                 attributes=None
                  ):
         '''Constructor'''
         self.filename = filename
@@ -42,4 +48,36 @@ class ClusteringRun(object):
         self.run_start_time = run_start_time
         self.end_time = end_time
         self.seconds_needed = seconds_needed
-        self.clustering = clustering
+        
+        # Linkage matrix of the run, see Strategy#initialize
+        self.linkage = linkage
+        
+        # Clustered DataElements, the initial clusters, None if unknown
+        self.elements = elements
+        
+        # Indices of the clustered attributes, None if unknown
+        self.attributes = attributes
+        
+        # LevelView on the clustering levels, created on first access
+        self._clustering = None
+
+    # \brief The clustering levels as LevelView, level k is a dict mapping 
+    #        the cluster ids to Cluster objects after k merges. The levels 
+    #        are derived from the linkage matrix on access.
+    # \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+    @property
+    def clustering(self):
+        '''The clustering levels as LevelView'''
+        if (self.elements is None):
+            raise HcluException("The elements of the run are not loaded")
+        if (self._clustering is None):
+            self._clustering = LevelView(self.linkage, self.elements)
+        return self._clustering
+
+    # \brief Returns the flat clusterings with k clusters or with all merges
+    #        up to the given height as label arrays.
+    # \see cut#cut
+    # \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+    def cut(self, k=None, height=None):
+        '''Returns the flat clusterings with k clusters or up to height'''
+        return cut(self, k, height)
@@ -15,7 +15,8 @@ You should have received a copy of the GNU General Public License
 along with hclu.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from c_record import CRecord
+import numpy
+
 from strategy import Strategy
 
 '''
@@ -45,49 +46,30 @@ class CompleteLinkageOptimized(Strategy):
         # Calling super Constructor
         super(CompleteLinkageOptimized, self).initialize(data)
         
-        # Counting Elements. Building c_matrix
+        # Counting Elements. Building c_matrix, distances of merged
+        # clusters are set to infinity.
         self.num_of_rec = len(data)
-        self.c_matrix = {}
-        for i in xrange(self.num_of_rec):
-            self.c_matrix[i] = {}
-        
-        for n in xrange(self.num_of_rec):
-            for i in xrange(n+1):
-                sim = self.distance_function.distance(data[n].data, data[i].data)
-                
-                tmp_record = CRecord(i,sim)
-                self.c_matrix[n][i] = tmp_record
-                
-                tmp_record = CRecord(n,sim)
-                self.c_matrix[i][n] = tmp_record
+        self.c_matrix = self.distance_matrix(data)
          
     def run(self):
         '''
         Run the Algorithm
         '''
         
+        deleted = numpy.empty(self.num_of_rec)
+        deleted.fill(numpy.inf)
+        
         for n in xrange(self.num_of_rec-1):
             # Searching next best
-            best = None
-            i1 = None
-            for i, sub_matrix in self.c_matrix.iteritems():
-                for c_record in sub_matrix.itervalues():
-                    if (c_record.index != i and \
-                        (best == None or best.sim > c_record.sim)):
-                            best = c_record
-                            i1 = i
+            best = numpy.argmin(self.c_matrix.values)
+            i1, i2 = self.c_matrix.pair(best)
                     
             # Merge
-            self.new_level(i1, best.index, best.sim)
+            self.new_level(i1, i2, float(self.c_matrix.values[best]))
             
             # Determine new Sim
-            for i in self.c_matrix[i1].iterkeys():
-                if i != i1 and i != best.index:
-                    if (self.c_matrix[best.index][i].sim>self.c_matrix[i1][i].sim):
-                        self.c_matrix[i1][i].sim = self.c_matrix[best.index][i].sim
-                        self.c_matrix[i][i1].sim = self.c_matrix[best.index][i].sim
+            self.c_matrix.set_row(i1, numpy.maximum(
+                self.c_matrix.row(i1), self.c_matrix.row(i2)))
             
             # Delete merged Cluster
-            del(self.c_matrix[best.index])
-            for sub_matrix in self.c_matrix.itervalues():
-                del(sub_matrix[best.index])
+            self.c_matrix.set_row(i2, deleted)
@@ -0,0 +1,130 @@
+"""
+This file is part of hclu.
+
+hclu is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+hclu is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with hclu.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""This module contains cophenetic distances and correlation."""
+
+import numpy as np
+
+# \file cophenetic.py
+# \brief Cophenetic distances of a linkage matrix and their correlation
+#        with the distances of the clustered elements. The cophenetic
+#        distance of two elements is the height of the merge joining
+#        them. In the leaf order of the dendrogram the elements of the
+#        two children of every merge are two adjacent ranges, so the
+#        pairs of a merge are found without walking Cluster objects.
+#        All matrices are condensed arrays as in DistanceMatrix and are
+#        processed in blocks of at most block_size cells.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+
+block_size = 2 ** 22
+
+# \brief Returns the condensed matrix of cophenetic distances of the
+#        linkage matrix. If out is given, e.g. a memory-mapped array,
+#        the distances are written to it.
+def cophenetic_distances(linkage, out=None):
+    """Returns the condensed matrix of cophenetic distances."""
+
+    linkage = np.asarray(linkage, dtype=np.float64)
+    n = len(linkage) + 1
+
+    if (out is None):
+        out = np.empty(n * (n - 1) // 2, dtype=np.float64)
+
+    for merge, indices in _merge_pairs(linkage):
+        out[indices] = linkage[merge, 2]
+
+    return out
+
+# \brief Returns the cophenetic correlation, the Pearson correlation of
+#        the cophenetic distances of the linkage matrix and the given
+#        condensed distances, a DistanceMatrix or an array. The
+#        cophenetic distances are not stored, each merge contributes
+#        its height times the sum of the distances it joins.
+def cophenetic_correlation(linkage, distances):
+    """Returns the cophenetic correlation of linkage and distances."""
+
+    linkage = np.asarray(linkage, dtype=np.float64)
+    values = getattr(distances, 'values', distances)
+    pairs = len(values)
+
+    # Means of both, the cophenetic distances are constant per merge
+    counts = np.zeros(len(linkage))
+    sums = np.zeros(len(linkage))
+    for merge, indices in _merge_pairs(linkage):
+        counts[merge] += len(indices)
+        sums[merge] += np.sum(values[indices])
+
+    mean_distance = _blockwise_sum(values, 0.0, 1) / pairs
+    mean_cophenetic = np.dot(counts, linkage[:, 2]) / pairs
+
+    # Centered sums of squares and products
+    cophenetic = linkage[:, 2] - mean_cophenetic
+    distance_squares = _blockwise_sum(values, mean_distance, 2)
+    cophenetic_squares = np.dot(counts, cophenetic ** 2)
+    products = np.dot(cophenetic, sums - counts * mean_distance)
+
+    return products / np.sqrt(distance_squares * cophenetic_squares)
+
+# \brief Returns the sum of (values - mean) ** power, computed blockwise
+#        for memory-mapped values.
+def _blockwise_sum(values, mean, power):
+    result = 0.0
+
+    for start in xrange(0, len(values), block_size):
+        block = np.asarray(values[start:start + block_size]) - mean
+        result += np.sum(block ** power)
+
+    return result
+
+# \brief Returns the elements in leaf order and the position of the
+#        first element of every cluster id in it. The first child of a
+#        merge is placed before the second.
+def _leaf_order(linkage):
+    n = len(linkage) + 1
+    children = linkage[:, :2].astype(np.intp).tolist()
+    sizes = [1] * n + linkage[:, 3].astype(np.intp).tolist()
+
+    start = [0] * (2 * n - 1)
+    for merge in xrange(n - 2, -1, -1):
+        left, right = children[merge]
+        start[left] = start[n + merge]
+        start[right] = start[n + merge] + sizes[left]
+
+    order = np.empty(n, dtype=np.intp)
+    order[start[:n]] = np.arange(n)
+
+    return order, start, sizes
+
+# \brief Yields pairs (merge, indices) with the condensed indices of
+#        pairs of elements joined by the merge. Large merges are split
+#        in several blocks.
+def _merge_pairs(linkage):
+    n = len(linkage) + 1
+    order, start, sizes = _leaf_order(linkage)
+    children = linkage[:, :2].astype(np.intp).tolist()
+
+    for merge in xrange(n - 1):
+        left, right = children[merge]
+        first = order[start[left]:start[left] + sizes[left]]
+        second = order[start[right]:start[right] + sizes[right]]
+        rows = max(1, block_size // len(second))
+
+        for block in xrange(0, len(first), rows):
+            i = first[block:block + rows, np.newaxis]
+            j = second[np.newaxis, :]
+            i, j = np.minimum(i, j), np.maximum(i, j)
+            yield merge, (n * i - i * (i + 1) // 2 + j - i - 1).ravel()
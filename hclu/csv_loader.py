@@ -0,0 +1,172 @@
+"""
+This file is part of hclu.
+
+hclu is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+hclu is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with hclu.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""This module contains the CSV loader."""
+
+import collections
+import csv
+import gzip
+import io
+import itertools
+import time
+
+import numpy as np
+
+from bzip2_file import Bzip2File
+from data_file import DataFile
+from hclu_exception import HcluException
+from progress import logger
+
+# \file csv_loader.py
+# \brief Loads a CSV file with a header line into a DataFile. The file is
+#        streamed in chunks of chunk_size rows, gzip and bzip2 compressed
+#        files are decompressed on the fly. The columns to cluster are 
+#        converted into one C-contiguous float64 matrix, in the order of 
+#        the columns in the file, which grows while loading. The other 
+#        columns are kept as string arrays. The DataElements are views on
+#        the rows. The loading rate is reported every report_interval 
+#        seconds and at the end.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+class CsvLoader(object):
+    """Loads a CSV file into a DataFile."""
+
+    chunk_size = 2 ** 16
+    report_interval = 5.0
+
+    def __init__(self, delimiter=','):
+        self.delimiter = delimiter
+
+    # \brief Returns the DataFile of filename clustering the columns with
+    #        the given indices.
+    # \throw HcluException { throws if the file is malformed. }
+    def load(self, filename, cluster_indices):
+        """Returns the DataFile of filename."""
+
+        if (len(cluster_indices) == 0):
+            raise HcluException("no attributes to cluster")
+
+        header, matrix, columns = self.read(filename, cluster_indices)
+
+        data_file = DataFile()
+        data_file.filename = filename
+        data_file.attributes = header
+        data_file.cluster_indices = list(cluster_indices)
+        data_file.set_data(matrix, columns)
+
+        return data_file
+
+    # \brief Reads filename and returns the header, the feature matrix of
+    #        the columns with the given indices and the other columns as
+    #        dict mapping the names to string arrays.
+    # \throw HcluException { throws if the file is malformed. }
+    def read(self, filename, cluster_indices):
+        """Reads filename and returns header, feature matrix and columns."""
+
+        with self.open(filename) as csv_file:
+            reader = csv.reader(csv_file, delimiter=self.delimiter)
+
+            try:
+                header = next(reader)
+            except StopIteration:
+                raise HcluException("file " + filename + " is empty")
+
+            width = len(header)
+            features = sorted(set(cluster_indices))
+            if (features and (features[0] < 0 or features[-1] >= width)):
+                raise HcluException("attribute indices out of range")
+
+            ignored = [index for index in xrange(width) 
+                if index not in features]
+
+            matrix = np.empty((0, len(features)), dtype=np.float64)
+            parts = dict((index, []) for index in ignored)
+            rows = 0
+            line = 1
+
+            start = last_report = time.time()
+
+            while True:
+                block = list(itertools.islice(reader, self.chunk_size))
+                if (len(block) == 0):
+                    break
+
+                for number, row in enumerate(block):
+                    if (row and len(row) != width):
+                        raise HcluException("line " + str(line + number + 1)
+                            + " has " + str(len(row)) + " instead of " + 
+                            str(width) + " columns")
+                line += len(block)
+
+                # Skip empty lines
+                chunk = [row for row in block if row]
+                if (len(chunk) == 0):
+                    continue
+
+                columns = zip(*chunk)
+
+                # Grow the matrix by doubling its capacity
+                if (rows + len(chunk) > len(matrix)):
+                    matrix.resize((max(2 * len(matrix), rows + len(chunk)), 
+                        len(features)), refcheck=False)
+
+                for j, index in enumerate(features):
+                    matrix[rows:rows + len(chunk), j] = np.array(
+                        columns[index], dtype=np.float64)
+
+                for index in ignored:
+                    parts[index].append(np.array(columns[index], dtype=str))
+
+                rows += len(chunk)
+
+                if (time.time() - last_report >= self.report_interval):
+                    last_report = time.time()
+                    self.report(rows, last_report - start)
+
+            self.report(rows, time.time() - start)
+
+        matrix.resize((rows, len(features)), refcheck=False)
+
+        columns = collections.OrderedDict(
+            (header[index], np.concatenate(parts[index]) if parts[index]
+                else np.array([], dtype=str))
+            for index in ignored)
+
+        return header, matrix, columns
+
+    # \brief Opens filename for reading, gzip and bzip2 compressed files
+    #        are recognized by their first bytes and decompressed. Files
+    #        with several compressed streams are read completely.
+    def open(self, filename):
+        """Opens filename for reading."""
+
+        with open(filename, 'rb') as raw_file:
+            magic = raw_file.read(3)
+
+        if (magic[:2] == '\x1f\x8b'):
+            # Buffering makes reading lines much faster
+            return io.BufferedReader(gzip.open(filename, 'rb'))
+        elif (magic == 'BZh'):
+            return io.BufferedReader(Bzip2File(filename))
+
+        return open(filename, 'rb')
+
+    # \brief Logs the number of rows loaded and the rate.
+    def report(self, rows, seconds):
+        """Logs the number of rows loaded and the rate."""
+
+        logger.info("Loaded %d rows, %.0f rows/s", rows, 
+            rows / max(seconds, 1e-6))
@@ -0,0 +1,127 @@
+"""
+This file is part of hclu.
+
+hclu is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+hclu is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with hclu.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""This module contains the flat cuts of a linkage matrix."""
+
+import numpy as np
+
+from hclu_exception import HcluException
+
+# \file cut.py
+# \brief Flat clusterings from a linkage matrix, either with k clusters or
+#        with all merges up to a height. All requested cuts are computed
+#        in one pass over the merges sorted by height, the labels of each
+#        cut in O(N).
+#
+#        Heights are monotonized first, the height of a merge is at least
+#        the height of the merges below it. For centroid and median
+#        linkage the heights of the linkage matrix may decrease, a cut at
+#        a height never splits a cluster formed below it.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+
+# \brief Returns the flat clusterings of run with k clusters or with all
+#        merges up to the given height. run is a ClusteringRun or a
+#        linkage matrix. k and height are a number or a list of numbers,
+#        exactly one of them is given. Returns one label array per number,
+#        a single array if a number is given. The labels are 0..m-1 for m
+#        clusters.
+def cut(run, k=None, height=None):
+    """Returns the flat clusterings of run with k clusters or up to height."""
+
+    linkage = np.asarray(getattr(run, 'linkage', run), dtype=np.float64)
+    n = len(linkage) + 1
+
+    if ((k is None) == (height is None)):
+        raise HcluException("Either k or height is needed for a cut")
+
+    heights = monotonic_heights(linkage)
+    order = np.argsort(heights, kind='mergesort')
+
+    # Number of merges, in order of height, of each requested cut
+    if (k is not None):
+        single = np.isscalar(k)
+        k = np.atleast_1d(np.asarray(k, dtype=np.intp))
+
+        if (np.any(k < 1) or np.any(k > n)):
+            raise HcluException("k must be between 1 and " + str(n))
+
+        steps = n - k
+    else:
+        single = np.isscalar(height)
+        height = np.atleast_1d(np.asarray(height, dtype=np.float64))
+        steps = np.searchsorted(heights[order], height, side='right')
+
+    # Union-find over the elements, union by size. root[c] is the root
+    # of the set of cluster id c.
+    parent = range(n)
+    size = [1] * n
+    root = range(n) + [None] * (n - 1)
+
+    requests = np.argsort(steps, kind='mergesort')
+    labels = [None] * len(steps)
+    step = 0
+
+    for request in requests:
+        while (step < steps[request]):
+            merge = order[step]
+            a = root[int(linkage[merge, 0])]
+            b = root[int(linkage[merge, 1])]
+
+            if (size[a] < size[b]):
+                a, b = b, a
+
+            parent[b] = a
+            size[a] += size[b]
+            root[n + merge] = a
+            step += 1
+
+        labels[request] = _labels(parent)
+
+    return labels[0] if single else labels
+
+# \brief Returns the heights of the linkage matrix, raised to the maximum
+#        height of the merges below each merge.
+def monotonic_heights(linkage):
+    """Returns the monotonized heights of the linkage matrix."""
+
+    n = len(linkage) + 1
+    heights = linkage[:, 2].tolist()
+    children = linkage[:, :2].astype(np.intp).tolist()
+
+    for merge in xrange(len(heights)):
+        for child in children[merge]:
+            if (child >= n and heights[child - n] > heights[merge]):
+                heights[merge] = heights[child - n]
+
+    return np.array(heights, dtype=np.float64)
+
+# \brief Returns the labels 0..m-1 of the sets of a union-find forest,
+#        numbered in order of their roots.
+def _labels(parent):
+    roots = np.array(parent, dtype=np.intp)
+
+    # Pointer jumping, union by size keeps the trees O(log N) deep
+    while True:
+        next_roots = roots[roots]
+        if (np.array_equal(next_roots, roots)):
+            break
+        roots = next_roots
+
+    is_root = np.zeros(len(roots), dtype=bool)
+    is_root[roots] = True
+
+    return (np.cumsum(is_root) - 1)[roots]
@@ -18,16 +18,45 @@ along with hclu.  If not, see <http://www.gnu.org/licenses/>.
 import numpy as np
 
 # \file data_element.py
-# \brief Representing one Element (or one line) of the input data
+# \brief Representing one Element (or one line) of the input data. The 
+#        element is a view on one row of a feature matrix and of the
+#        columns of the other attributes, which are shared by all
+#        elements of a DataFile.
 # \author Bjoern Borgmann <bjoern.borgmann@uni-oldenburg.de>
 class DataElement(object):
 
+    __slots__ = ('matrix', 'columns', 'index')
+
+    # \brief Creates a standalone element with the given data and the
+    #        attributes with the given names.
     def __init__(self, data, attributes=None, attributes_name=None):
         if (not isinstance(data, np.ndarray)):
             raise TypeError("data is not a numpy array")
         
-        self.data = data
-        self.attributes={}
+        self.matrix = data[np.newaxis]
+        self.columns = {}
+        self.index = 0
         
         for i in xrange(len(attributes)):
-            self.attributes[attributes_name[i]] = attributes[i]
+            self.columns[attributes_name[i]] = [attributes[i]]
+
+    # \brief Creates the element of row index of the feature matrix and 
+    #        the attribute columns, a dict mapping names to arrays.
+    @classmethod
+    def view(cls, matrix, columns, index):
+        element = cls.__new__(cls)
+        element.matrix = matrix
+        element.columns = columns
+        element.index = index
+        return element
+
+    # \brief The data of the element as array
+    @property
+    def data(self):
+        return self.matrix[self.index]
+
+    # \brief The other attributes of the element as dict
+    @property
+    def attributes(self):
+        return dict((name, column[self.index]) 
+            for name, column in self.columns.iteritems())
@@ -15,6 +15,8 @@ You should have received a copy of the GNU General Public License
 along with hclu.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+from data_element import DataElement
+
 # \file hclu.py
 # \brief Class for representing one data file which was been loaded
 # \author Bjoern Borgmann <bjoern.borgmann@uni-oldenburg.de>   
@@ -28,4 +30,21 @@ class DataFile(object):
         self.elements = []
         self.filename = None
         self.attributes = None
+        self.cluster_indices = None
+        
+        # Feature matrix, one row per element, and the other attributes 
+        # as dict mapping the names to columns
+        self.data = None
+        self.columns = None
         self.numOfElements = None
+
+    # \brief Sets the feature matrix and the attribute columns and creates
+    #        one DataElement view per row.
+    # \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+    def set_data(self, matrix, columns):
+        '''Sets the feature matrix and the attribute columns'''
+        self.data = matrix
+        self.columns = columns
+        self.elements = [DataElement.view(matrix, columns, i) 
+            for i in xrange(len(matrix))]
+        self.numOfElements = len(matrix)
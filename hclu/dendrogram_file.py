@@ -0,0 +1,126 @@
+"""
+This file is part of hclu.
+
+hclu is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+hclu is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with hclu.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""This module contains the binary format of clustering runs."""
+
+import datetime
+import json
+import os
+
+import numpy as np
+
+from clustering_run import ClusteringRun
+from hclu_exception import HcluException
+
+# \file dendrogram_file.py
+# \brief Binary format of a clustering run. The linkage matrix is stored
+#        as .npy file, the run information as .json file next to it with
+#        the same base name. The linkage matrix can be written row by row
+#        while the strategy runs and is memory-mapped when loaded.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+
+version = 1
+time_format = '%Y-%m-%d %H:%M:%S.%f'
+
+# \brief Returns the paths of the .npy and the .json file of the given
+#        path, with or without the .npy suffix.
+def paths(path):
+    """Returns the paths of the .npy and the .json file of path."""
+
+    if (path.endswith('.npy')):
+        path = path[:-len('.npy')]
+
+    return path + '.npy', path + '.json'
+
+# \brief Returns a new linkage matrix with the given number of merges
+#        as array memory-mapped to the .npy file of path.
+def open_linkage(path, merges):
+    """Returns a new linkage matrix memory-mapped to the file of path."""
+
+    if (merges == 0):
+        # Empty files can not be memory-mapped, written by save_run
+        return np.zeros((0, 4), dtype=np.float64)
+
+    return np.lib.format.open_memmap(paths(path)[0], mode='w+',
+        dtype=np.float64, shape=(merges, 4))
+
+# \brief Saves run to path. The linkage matrix is only flushed if it is
+#        already memory-mapped to the file of path.
+def save_run(run, path):
+    """Saves run to path."""
+
+    linkage_path, info_path = paths(path)
+    linkage = run.linkage
+
+    if (isinstance(linkage, np.memmap) and linkage.filename is not None
+        and os.path.abspath(linkage.filename) ==
+            os.path.abspath(linkage_path)):
+        linkage.flush()
+    else:
+        np.save(linkage_path, linkage)
+
+    info = {
+        'version': version,
+        'filename': run.filename,
+        'strategy_description': run.strategy_description,
+        'distance_function_description':
+            run.distance_function_description,
+        'init_start_time': run.init_start_time.strftime(time_format),
+        'run_start_time': run.run_start_time.strftime(time_format),
+        'end_time': run.end_time.strftime(time_format),
+        'attributes': run.attributes,
+        'seconds_needed': run.seconds_needed.total_seconds(),
+        'size': len(run.linkage) + 1}
+
+    with open(info_path, 'w') as info_file:
+        json.dump(info, info_file, indent=1, sort_keys=True)
+
+# \brief Loads the run saved to path with a read-only memory-mapped
+#        linkage matrix. The clustering levels need the clustered
+#        DataElements, which are not part of the file.
+def load_run(path, elements=None):
+    """Loads the run saved to path."""
+
+    linkage_path, info_path = paths(path)
+
+    try:
+        with open(info_path) as info_file:
+            info = json.load(info_file)
+
+        linkage = np.load(linkage_path, mmap_mode='r')
+    except (IOError, ValueError) as error:
+        raise HcluException("loading run failed: " + str(error))
+
+    if (info['version'] != version):
+        raise HcluException("unknown version of run file " + info_path)
+
+    if (elements is not None and len(elements) != info['size']):
+        raise HcluException("number of elements does not match the run")
+
+    parse = lambda key : datetime.datetime.strptime(info[key], time_format)
+
+    return ClusteringRun(
+        info['filename'],
+        info['strategy_description'],
+        info['distance_function_description'],
+        parse('init_start_time'),
+        parse('run_start_time'),
+        parse('end_time'),
+        datetime.timedelta(seconds=info['seconds_needed']),
+        linkage,
+        elements,
+        info.get('attributes'))
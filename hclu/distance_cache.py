@@ -0,0 +1,142 @@
+"""
+This file is part of hclu.
+
+hclu is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+hclu is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with hclu.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""This module contains the persistent distance matrix cache."""
+
+import os
+import glob
+import hashlib
+import tempfile
+import numpy as np
+
+# \file distance_cache.py
+# \brief Directory of condensed distance matrices stored as .npy files.
+#        Matrices are keyed by a hash of the clustered data, the indices
+#        of the clustered attributes and the distance function. If the 
+#        cache grows above max_size bytes, the least recently used 
+#        matrices are removed.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+class DistanceCache(object):
+    """Directory of condensed distance matrices stored as .npy files."""
+
+    suffix = '.npy'
+
+    # \brief Initialize the cache in directory, which is created if it
+    #        does not exist.
+    def __init__(self, directory, max_size=2 ** 30):
+        """Initialize the cache in directory."""
+
+        if (not os.path.isdir(directory)):
+            os.makedirs(directory)
+
+        self.directory = directory
+        self.max_size = max_size
+
+    # \brief Returns the key of the distances between the rows of
+    #        data_matrix computed with distance_function.
+    def key(self, data_matrix, distance_function, attributes=None):
+        """Returns the cache key of a distance matrix."""
+
+        data_matrix = np.ascontiguousarray(data_matrix, dtype=np.float64)
+        function = type(distance_function)
+
+        checksum = hashlib.sha1()
+        checksum.update(str(data_matrix.shape))
+        checksum.update(data_matrix.data)
+        checksum.update(repr(attributes))
+        checksum.update(function.__module__ + '.' + function.__name__)
+        checksum.update(repr(sorted(vars(distance_function).items())))
+
+        return checksum.hexdigest()
+
+    # \brief Returns the path of the file of the given key.
+    def path(self, key):
+        """Returns the path of the file of the given key."""
+
+        return os.path.join(self.directory, key + self.suffix)
+
+    # \brief Returns the cached condensed matrix of the given key as
+    #        read-only memory-mapped array, None if it is not cached.
+    def load(self, key):
+        """Returns the cached condensed matrix of the given key or None."""
+
+        path = self.path(key)
+
+        try:
+            values = np.load(path, mmap_mode='r')
+        except (IOError, ValueError):
+            return None
+
+        # Mark as recently used
+        os.utime(path, None)
+
+        return values
+
+    # \brief Stores the condensed matrix values under the given key and
+    #        removes least recently used matrices exceeding max_size.
+    #        Matrices larger than max_size are not stored.
+    def store(self, key, values):
+        """Stores the condensed matrix values under the given key."""
+
+        if (values.nbytes > self.max_size):
+            return
+
+        # Write to a temporary file first, so that concurrent runs never
+        # read a partially written matrix.
+        handle, tmp_path = tempfile.mkstemp(
+            suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(handle, 'wb') as tmp_file:
+                np.save(tmp_file, values)
+            os.rename(tmp_path, self.path(key))
+        except Exception:
+            if (os.path.exists(tmp_path)):
+                os.remove(tmp_path)
+            raise
+
+        self.evict(self.max_size)
+
+    # \brief Removes least recently used matrices until the cache uses at
+    #        most max_size bytes.
+    def evict(self, max_size):
+        """Removes least recently used matrices above max_size bytes."""
+
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, '*' + self.suffix)):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        size = sum(entry[1] for entry in entries)
+
+        for mtime, entry_size, path in entries:
+            if (size <= max_size):
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            size -= entry_size
+
+    # \brief Removes all matrices of the cache.
+    def clear(self):
+        """Removes all matrices of the cache."""
+
+        self.evict(0)
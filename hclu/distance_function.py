@@ -17,12 +17,72 @@ along with hclu.  If not, see <http://www.gnu.org/licenses/>.
 
 """This module contains the abstract class for distance functions."""
 
+import numpy as np
+
 # \brief This class is a distance function strategy base class.
 # \author Bjoern Borgmann <bjoern.borgmann@uni-oldenburg.de>
 # \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
 class DistanceFunction(object):
     """This class is a distance function strategy base class."""
 
+    # Maximum number of float64 values of a temporary block used by
+    # broadcasting implementations of cdist.
+    block_size = 2 ** 22
+
     def distance(self, data1, data2):
         pass
 
+    # \brief Returns the matrix of distances between all rows of X.
+    #        Entry [i][j] is the distance between X[i] and X[j].
+    def pairwise(self, X):
+        """Returns the matrix of distances between all rows of X."""
+
+        X = np.asarray(X, dtype=np.float64)
+        return self.cdist(X, X)
+
+    # \brief Returns the matrix of distances between the rows of X and
+    #        the rows of Y. Entry [i][j] is the distance between X[i]
+    #        and Y[j]. This fallback calls distance once per pair,
+    #        subclasses override it with vectorized implementations.
+    def cdist(self, X, Y):
+        """Returns the matrix of distances between the rows of X and Y."""
+
+        X = np.asarray(X, dtype=np.float64)
+        Y = np.asarray(Y, dtype=np.float64)
+
+        result = np.empty((len(X), len(Y)), dtype=np.float64)
+
+        for i in xrange(len(X)):
+            for j in xrange(len(Y)):
+                result[i, j] = self.distance(X[i], Y[j])
+
+        return result
+
+    # \brief Helper for broadcasting implementations. Splits the rows of X
+    #        in blocks, so that the temporary X-block x Y x dimension
+    #        array stays below block_size values.
+    def _blocks(self, X, Y):
+        """Yields row slices of X bounding the broadcasting temporaries."""
+
+        cells = max(1, len(Y) * (X.shape[1] if X.ndim > 1 else 1))
+        rows = max(1, self.block_size // cells)
+
+        for start in xrange(0, len(X), rows):
+            yield slice(start, min(start + rows, len(X)))
+
+    # \brief Helper for broadcasting implementations. Returns the squared
+    #        euclidean distances between the rows of X and Y, computed
+    #        from the differences like distance, so identical rows have
+    #        distance 0 and small distances keep their precision.
+    def _squared_euclidean(self, X, Y):
+        """Returns the squared euclidean distances between rows of X, Y."""
+
+        X = np.asarray(X, dtype=np.float64)
+        Y = np.asarray(Y, dtype=np.float64)
+
+        result = np.empty((len(X), len(Y)), dtype=np.float64)
+        for block in self._blocks(X, Y):
+            difference = X[block, np.newaxis, :] - Y[np.newaxis, :, :]
+            result[block] = np.einsum('ijk,ijk->ij', difference, difference)
+
+        return result
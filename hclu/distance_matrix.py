@@ -0,0 +1,212 @@
+"""
+This file is part of hclu.
+
+hclu is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+hclu is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with hclu.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""This module contains the condensed distance matrix."""
+
+import multiprocessing
+import numpy as np
+
+from multiprocessing.sharedctypes import RawArray
+
+# Matrix, data and distance function of the running parallel fill. Set 
+# before the worker processes are forked, so they inherit it.
+_parallel_fill = None
+
+# \brief Worker of the parallel fill, fills one block of rows directly
+#        into the shared storage of the matrix.
+def _fill_block(block):
+    matrix, data_matrix, distance_function = _parallel_fill
+    matrix.fill_rows(data_matrix, distance_function, block[0], block[1])
+
+# \file distance_matrix.py
+# \brief Symmetric distance matrix storing only the upper triangle
+#        (without diagonal) in one flat float64 array of n(n-1)/2 cells.
+#        Cell (i, j) with i < j is stored at n*i - i*(i+1)/2 + j - i - 1,
+#        which is the layout of scipy.spatial.distance.pdist.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+class DistanceMatrix(object):
+    """Symmetric distance matrix in condensed upper triangular form."""
+
+    # Maximum number of float64 values computed at once by fill.
+    block_size = 2 ** 22
+
+    # \brief Initialize a matrix for size elements. If values is given it
+    #        is used as storage, it has to have n(n-1)/2 cells. If shared
+    #        is set, the storage is allocated in shared memory, so that 
+    #        forked processes can fill it in parallel.
+    def __init__(self, size, values=None, shared=False):
+        """Initialize a matrix for size elements."""
+
+        self.size = size
+        self.length = size * (size - 1) // 2
+        self.shared = shared
+
+        if (values is None):
+            values = self._allocate(self.length)
+        elif (len(values) != self.length):
+            raise ValueError("values has not n(n-1)/2 cells")
+
+        self.values = values
+
+    # \brief Allocates the flat storage. Overwritten by other backends.
+    def _allocate(self, length):
+        """Allocates the flat storage."""
+
+        if (self.shared and length > 0):
+            return np.frombuffer(RawArray('d', length), dtype=np.float64)
+
+        return np.zeros(length, dtype=np.float64)
+
+    # \brief Returns the position of cell (i, j) in the flat storage.
+    def index(self, i, j):
+        """Returns the position of cell (i, j) in the flat storage."""
+
+        if (i == j):
+            raise IndexError("diagonal is not stored")
+        if (i > j):
+            i, j = j, i
+
+        return self.size * i - i * (i + 1) // 2 + j - i - 1
+
+    # \brief Returns the cell (i, j) for a given position of the flat
+    #        storage, inverse of index.
+    def pair(self, index):
+        """Returns the cell (i, j) for a given position."""
+
+        n = self.size
+        b = 2 * n - 1
+        i = int((b - np.sqrt(b * b - 8.0 * index)) // 2)
+
+        # Correct floating point errors of the square root
+        while (i > 0 and self._row_start(i) > index):
+            i -= 1
+        while (self._row_start(i + 1) <= index):
+            i += 1
+
+        return i, int(index - self._row_start(i) + i + 1)
+
+    # \brief Returns the position of cell (i, i+1) in the flat storage.
+    def _row_start(self, i):
+        return self.size * i - i * (i + 1) // 2
+
+    # \brief Returns the flat positions of all cells of row i. The position
+    #        of cell (i, i) is -1.
+    def row_indices(self, i):
+        """Returns the flat positions of all cells of row i."""
+
+        result = np.empty(self.size, dtype=np.int64)
+
+        # cells (j, i) with j < i
+        j = np.arange(i, dtype=np.int64)
+        result[:i] = self.size * j - j * (j + 1) // 2 + i - j - 1
+
+        # cells (i, j) with j > i are contiguous
+        start = self._row_start(i)
+        result[i] = -1
+        result[i + 1:] = np.arange(start, start + self.size - i - 1)
+
+        return result
+
+    # \brief Returns row i as array of size elements. The diagonal cell
+    #        is 0.
+    def row(self, i):
+        """Returns row i as array."""
+
+        result = np.empty(self.size, dtype=np.float64)
+        start = self._row_start(i)
+
+        result[:i] = self.values[self.row_indices(i)[:i]]
+        result[i] = 0.0
+        result[i + 1:] = self.values[start:start + self.size - i - 1]
+
+        return result
+
+    # \brief Sets row (and column) i to the given values. The value at
+    #        position i is ignored.
+    def set_row(self, i, values):
+        """Sets row (and column) i to the given values."""
+
+        start = self._row_start(i)
+
+        self.values[self.row_indices(i)[:i]] = values[:i]
+        self.values[start:start + self.size - i - 1] = values[i + 1:]
+
+    # \brief Fills the matrix with the distances between the rows of
+    #        data_matrix using the batch API of distance_function. The
+    #        distances are computed in blocks of rows. With more than one
+    #        job and shared storage the blocks are filled by a pool of 
+    #        processes, which write directly into the storage.
+    def fill(self, data_matrix, distance_function, jobs=1):
+        """Fills the matrix with the distances between rows of data_matrix."""
+
+        global _parallel_fill
+
+        if (jobs <= 1 or not self.shared):
+            for start, end in self.blocks():
+                self.fill_rows(data_matrix, distance_function, start, end)
+            return
+
+        _parallel_fill = (self, data_matrix, distance_function)
+        pool = multiprocessing.Pool(jobs)
+        try:
+            for result in pool.imap_unordered(_fill_block, self.blocks()):
+                pass
+            pool.close()
+        except:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+            _parallel_fill = None
+
+    # \brief Returns the row ranges (start, end) filled at once. Each block
+    #        covers about block_size cells, so lower rows, which have less
+    #        cells in the upper triangle, are grouped in bigger blocks.
+    def blocks(self):
+        """Returns the row ranges (start, end) filled at once."""
+
+        result = []
+        start = 0
+
+        while (start < self.size):
+            rows = max(1, self.block_size // max(1, self.size - start))
+            end = min(start + rows, self.size)
+            result.append((start, end))
+            start = end
+
+        return result
+
+    # \brief Fills the cells (i, j) with start <= i < end and j > i.
+    def fill_rows(self, data_matrix, distance_function, start, end):
+        """Fills the upper triangle of the rows start to end."""
+
+        block = distance_function.cdist(
+            data_matrix[start:end], data_matrix[start:])
+
+        for i in xrange(start, end):
+            offset = self._row_start(i)
+            self.values[offset:offset + self.size - i - 1] = \
+                block[i - start, i - start + 1:]
+
+    def __getitem__(self, cell):
+        return self.values[self.index(cell[0], cell[1])]
+
+    def __setitem__(self, cell, value):
+        self.values[self.index(cell[0], cell[1])] = value
+
+    def __len__(self):
+        return self.size
@@ -15,6 +15,8 @@ You should have received a copy of the GNU General Public License
 along with hclu.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import numpy as np
+
 from numpy import linalg 
 from distance_function import DistanceFunction
 import math
@@ -29,3 +31,6 @@ class EuclideanDistance(DistanceFunction):
     
     def distance(self, data1, data2):
         return linalg.norm(data1-data2)
+
+    def cdist(self, X, Y):
+        return np.sqrt(self._squared_euclidean(X, Y))
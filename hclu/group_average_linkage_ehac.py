@@ -15,12 +15,13 @@ You should have received a copy of the GNU General Public License
 along with hclu.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-"""This module contains single linkage with efficient HAC algorithm"""
+"""This module contains group-average linkage with efficient HAC algorithm"""
 
 import numpy
 
 from strategy import Strategy
-from priority_dict import PriorityDict
+from indexed_heap import IndexedHeap
+from tournament_tree import TournamentTree
 
 # \file group_average_linkage_ehac.py
 # \brief Average Linkage with EfficentHAC algorithm, 
@@ -65,29 +66,39 @@ class GroupAverageLinkageEfficientHAC(Strategy):
         # titled 'P' in pseudo code
         self.priority_queues = []
 
-        # simialarity matrix (titled 'C' in pseudo code)
-        self.simialarities = [[CRecord() for j in range(0, self.data_length)]
-            for k in range(0, self.data_length)]
+        # simialarity matrix (titled 'C' in pseudo code), condensed
+        # upper triangular matrix of dot products. The priority queues
+        # return the smallest value, so their priorities are the negated
+        # similarities.
+        self.simialarities = self.new_distance_matrix(self.data_length)
 
-        # time complexity O(N^2) because N^2 + O(N * log N) where N = len(data)
-        # space complexity self.simialarities N^2 and self.priority_queues N^2
+        normalized = numpy.vstack(self.data)
         for n in range(0, self.data_length):
-            for i in range(0, self.data_length):
+            self.simialarities.set_row(n, 
+                numpy.dot(normalized, normalized[n]))
 
-                self.simialarities[n][i].sim = \
-                    numpy.dot(self.data[n], self.data[i])
+        # time complexity O(N^2) because N^2 + O(N * log N) where N = len(data)
+        # space complexity self.simialarities N^2/2 and 
+        # self.priority_queues N^2, stored in compact arrays
+        for n in range(0, self.data_length):
+            self.not_merged[n] = 1
 
-                self.simialarities[n][i].index = i
-                self.not_merged[n] = 1
-        
-            self.priority_queues.append(PriorityDict())
+            others = numpy.arange(self.data_length) != n
+            self.priority_queues.append(IndexedHeap(self.data_length,
+                numpy.flatnonzero(others), 
+                -self.simialarities.row(n)[others]))
 
-            for i in range(0, self.data_length):
-                if(i != n):
-                    self.priority_queues[n][i] = self.simialarities[n][i]
+        # global index over the smallest entries of all priority queues
+        # and the keys of these entries
+        self.heads = TournamentTree(self.data_length)
+        self.head_keys = [None] * self.data_length
+        for n in range(0, self.data_length):
+            self._update_head(n)
         
     # \brief Implementation of abstract run method, time complexity
-    #        O(N^2 * log N), space complexity 0.
+    #        O(N^2 * log N), space complexity 0. The best pair is taken
+    #        from the global index in O(1), the index is updated in 
+    #        O(log N) for each row whose head changed.
     #
     # \see Strategy#run
     # \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
@@ -99,28 +110,11 @@ class GroupAverageLinkageEfficientHAC(Strategy):
         # space complexity 0
         for k in range(0, self.data_length - 1):
             
-            # arg max (k: I[k]=1)
-            firstRun = True
-
-            # time complexity O(N) where N is amount of clusters
-            # space complexity 0
-            for z in range(0, self.data_length):
-                if self.not_merged[z] != 1: 
-                    continue
-    
-                smallest = self.priority_queues[z].smallest()
-                simularity = smallest.sim
-                index = smallest.index
-
-                if firstRun: 
-                    k1 = z
-                    maximum = simularity 
-                    maximum_index = index
-                    firstRun = False
-                if maximum < simularity:
-                    k1 = z
-                    maximum = simularity
-                    maximum_index = index
+            # arg max (k: I[k]=1), time complexity O(1) using the 
+            # global index over the heads of the priority queues
+            k1 = self.heads.smallest_item()[0]
+            maximum_index, maximum = self.priority_queues[k1].smallest_item()
+            maximum = -maximum
 
             k2 = maximum_index
  
@@ -130,7 +124,9 @@ class GroupAverageLinkageEfficientHAC(Strategy):
             self.vectorsum[k1] += self.vectorsum[k2]
 
             self.not_merged[k2] = 0
-            self.priority_queues[k1] = PriorityDict() 
+            del self.heads[k2]
+            keys = []
+            sims = []
 
             # time complexity O(N * log N) where N is amount of clusters
             # space complexity 0
@@ -148,27 +144,36 @@ class GroupAverageLinkageEfficientHAC(Strategy):
                     normalizingfactor = 1.0/((amountsum) * (amountsum - 1))
                     dotp = numpy.dot(vectorsum, vectorsum.conj()) 
                    
-                    self.simialarities[i][k1].sim = \
-                        normalizingfactor * \
-                        (dotp - amountsum)
+                    sim = normalizingfactor * (dotp - amountsum)
+                    self.simialarities[i, k1] = sim
                           
-                    self.priority_queues[i][k1] = self.simialarities[i][k1]
+                    self.priority_queues[i][k1] = -sim
 
                     # k1 to i
 
-                    self.simialarities[k1][i].sim = self.simialarities[i][k1].sim
-                    self.priority_queues[k1][i] = self.simialarities[k1][i]
-
-class CRecord:
-    
-    def __init__(self):
-        self.sim = None
-        self.index = None
-
-    def __lt__(self, other):
-        if(not isinstance(other, CRecord)):
-            raise TypeError("not a CRecord")            
-        return self.sim > other.sim
-
-    def __repr__(self):
-        return str(self.sim) + " " + str(self.index)
+                    keys.append(i)
+                    sims.append(-sim)
+
+                    # update the global index only if the head changed
+                    if self.head_keys[i] == k1 or self.head_keys[i] == k2:
+                        self._update_head(i)
+                    elif (-sim, k1) < (self.heads[i], self.head_keys[i]):
+                        self.heads[i] = -sim
+                        self.head_keys[i] = k1
+
+            # the queue of the merged cluster is built at once
+            self.priority_queues[k1] = IndexedHeap(
+                self.data_length, keys, sims)
+            self._update_head(k1)
+
+    # \brief Sets the entry of cluster i in the global index to the 
+    #        smallest entry of its priority queue.
+    def _update_head(self, i):
+        """Updates the entry of cluster i in the global index"""
+
+        if self.priority_queues[i]:
+            self.head_keys[i], self.heads[i] = \
+                self.priority_queues[i].smallest_item()
+        else:
+            self.head_keys[i] = None
+            del self.heads[i]
@@ -15,10 +15,9 @@ You should have received a copy of the GNU General Public License
 along with hclu.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from c_record import CRecord
+import numpy
+
 from strategy import Strategy
-from operator import mul
-import copy
 
 '''
 Created on Jan 24, 2012
@@ -26,16 +25,22 @@ Created on Jan 24, 2012
 @author: bjoern.borgmann <bjoern.borgmann@uni-oldenburg.de>
 '''
 
-# \file single_linkage_naive.py
-# \brief Optimized naive Group-Average-Linkage Implementation.
+# \file group_average_linkage_optimized.py
+# \brief Optimized Group-Average-Linkage Implementation. The similarity of
+#        two clusters is the average distance over all pairs of elements 
+#        of their union. It is kept as running aggregates: the sum of the
+#        distances inside of each cluster, the sum of the distances 
+#        between each two clusters and the number of elements. A merge
+#        adds the aggregates in O(1) per neighbour as one vectorized row
+#        update. The nearest neighbour of every cluster is cached.
 # \author Bjoern Borgmann <bjoern.borgmann@uni-oldenburg.de>
 class GroupAverageLinkageOptimized(Strategy):
     '''
-    Optimized naive Group-Average-Linkage Implementation
+    Optimized Group-Average-Linkage Implementation
     '''
     
     #Strategy Description
-    description = "Optimized naive Group-Average-Linkage Implementation"
+    description = "Optimized Group-Average-Linkage Implementation"
 
     # \brief Initialize the Alogrithm
     # \author Bjoern Borgmann <bjoern.borgmann@uni-oldenburg.de>
@@ -47,32 +52,23 @@ class GroupAverageLinkageOptimized(Strategy):
         # Calling super Constructor
         super(GroupAverageLinkageOptimized, self).initialize(data)
         
-        # Counting Elements. Building c_matrix and complete c_matrix
+        # Counting Elements. c_matrix holds the sum of the distances 
+        # between the elements of two clusters.
         self.num_of_rec = len(data)
-        self.c_matrix = {}
-        self.complete_c_matrix = {}
+        self.c_matrix = self.distance_matrix(data)
         
-        for i in xrange(self.num_of_rec):
-            self.c_matrix[i] = {}
-            self.complete_c_matrix[i] = {}
+        # Sum of the distances inside of each cluster and its size
+        self.inner_sums = numpy.zeros(self.num_of_rec)
+        self.counts = numpy.ones(self.num_of_rec)
+        self.active = numpy.ones(self.num_of_rec, dtype=bool)
+        
+        # Nearest neighbour and its sim of each cluster
+        self.nn_index = numpy.zeros(self.num_of_rec, dtype=numpy.int64)
+        self.nn_sim = numpy.empty(self.num_of_rec)
+        self.nn_sim.fill(numpy.inf)
         
-        for n in xrange(self.num_of_rec):
-            for i in xrange(n+1):
-                sim = self.distance_function.distance(data[n].data, data[i].data)
-                
-                tmp_record = CRecord(i,sim)
-                tmp_record2 = CRecord(i,sim)
-                self.c_matrix[n][i] = tmp_record
-                self.complete_c_matrix[n][i] = tmp_record2
-
-                tmp_record = CRecord(n,sim)
-                tmp_record2 = CRecord(i,sim)
-                self.c_matrix[i][n] = tmp_record
-                self.complete_c_matrix[i][n] = tmp_record2    
-                            
-        self.cluster_index_lists = {}
         for i in xrange(self.num_of_rec):
-            self.cluster_index_lists[i]=[i]
+            self._update_nearest(i, self._sims(i))
                 
     def run(self):
         '''
@@ -81,52 +77,61 @@ class GroupAverageLinkageOptimized(Strategy):
         
         for n in xrange(self.num_of_rec-1):
             # Searching next best
-            best = None
-            i1 = None
-            for i, sub_matrix in self.c_matrix.iteritems():
-                for c_record in sub_matrix.itervalues():
-                    if (c_record.index != i and \
-                        (best == None or best.sim > c_record.sim)):
-                            best = c_record
-                            i1 = i
+            i1 = int(numpy.argmin(self.nn_sim))
+            i2 = int(self.nn_index[i1])
                     
             # Merge
-            self.new_level(i1, best.index, best.sim)
-
-            for i in self.c_matrix[i1].iterkeys():
-                # No Sim for new cluster with his self
-                if i != i1 and i != best.index:
-                    # Calculate the number of the sims between both cluster before
-                    # the new Merge. (Fakultaet fuer anzahl elemente minus 1)
-                    #num_of_sims = \
-                    #    reduce(mul, xrange(2, len(self.cluster_index_lists[i1])+len(self.cluster_index_lists[i])), 1)
-                    num_of_sims = 0
-                    
-                    # Init current value
-                    #curr_value = self.c_matrix[i1][i]*num_of_sims
-                    curr_value = 0
-                    
-                    elements = self.cluster_index_lists[i1]+self.cluster_index_lists[i]
-                    
-                    for k in xrange(len(elements[:-1])):
-                        for ind2 in elements[k+1:]:
-                            ind1 = elements[k]
-                            
-                            curr_value+=\
-                                self.complete_c_matrix[ind1][ind2].sim
-                            num_of_sims += 1
-                    
-                    # New Sim
-                    new_sim = curr_value / num_of_sims
-                    
-                    self.c_matrix[i1][i].sim = new_sim
-                    self.c_matrix[i][i1].sim = new_sim
-                    
-            # Update Cluster Index List
-            self.cluster_index_lists[i1].append(best.index)
-            #del(self.cluster_index_lists[best.index])
+            self.new_level(i1, i2, float(self.nn_sim[i1]))
+            
+            # Add aggregates of i2 to i1, delete i2
+            self.inner_sums[i1] += self.inner_sums[i2] + self.c_matrix[i1, i2]
+            self.counts[i1] += self.counts[i2]
+            self.c_matrix.set_row(i1, 
+                self.c_matrix.row(i1) + self.c_matrix.row(i2))
+            
+            self.active[i2] = False
+            self.nn_sim[i2] = numpy.inf
             
-            # Delete merged Cluster
-            del(self.c_matrix[best.index])
-            for sub_matrix in self.c_matrix.itervalues():
-                del(sub_matrix[best.index])
+            # New Sims of the new cluster to all others
+            sims = self._sims(i1)
+            self._update_nearest(i1, sims)
+            
+            # Clusters with one of the merged clusters as nearest neighbour
+            # are searched again, all others can only get closer.
+            stale = self.active & (
+                (self.nn_index == i1) | (self.nn_index == i2))
+            stale[i1] = False
+            
+            closer = self.active & ~stale & (sims < self.nn_sim)
+            self.nn_sim[closer] = sims[closer]
+            self.nn_index[closer] = i1
+            
+            for i in numpy.flatnonzero(stale):
+                self._update_nearest(i, self._sims(i))
+    
+    # \brief Returns the sims of cluster i to all clusters, the average 
+    #        distance over all pairs of elements of both clusters including
+    #        pairs inside of each cluster. Infinite for i itself and merged
+    #        clusters.
+    def _sims(self, i):
+        '''
+        Returns the sims of cluster i to all clusters
+        '''
+        
+        counts = self.counts[i] + self.counts
+        sims = (self.inner_sums[i] + self.inner_sums + self.c_matrix.row(i)) \
+            / (counts * (counts - 1) / 2.0)
+        
+        sims[~self.active] = numpy.inf
+        sims[i] = numpy.inf
+        
+        return sims
+    
+    # \brief Sets the nearest neighbour of cluster i from its sims
+    def _update_nearest(self, i, sims):
+        '''
+        Sets the nearest neighbour of cluster i from its sims
+        '''
+        
+        self.nn_index[i] = numpy.argmin(sims)
+        self.nn_sim[i] = sims[self.nn_index[i]]
@@ -19,33 +19,47 @@ along with hclu.  If not, see <http://www.gnu.org/licenses/>.
 
 """This is the main module containing the Hclu facade"""
 
-import csv
-import numpy as np
 import traceback
 import sys
 import datetime
 import argparse
+import logging
 
-from sets import Set
 from strategy import Strategy
-from data_file import DataFile
-from data_element import DataElement
+from csv_loader import CsvLoader
+from binary_dataset import BinaryDataset
 from hclu_exception import HcluException
 from clustering_run import ClusteringRun
-
-# method strategies
-
-from single_linkage_nbm import SingleLinkageNbm
-from complete_linkage_ehac import CompleteLinkageEfficientHAC
-from group_average_linkage_optimized import GroupAverageLinkageOptimized
-from centroid_linkage_optimized import CentroidLinkageOptimized 
-
-# distance strategies
-
-from euclidean_distance import EuclideanDistance
-from quadratic_euclidean_distance import QuadraticEuclideanDistance
-from maximum_distance import MaximumDistance 
-from manhatten_distance import ManhattenDistance
+from distance_cache import DistanceCache
+from dendrogram_file import save_run
+from cophenetic import cophenetic_correlation
+
+from registry import Registry
+
+# method strategies, imported on first use
+
+strategies = Registry([
+    ('single-linkage', 'single_linkage_nbm:SingleLinkageNbm'),
+    ('single-linkage-mst', 'single_linkage_mst:SingleLinkageMst'),
+    ('complete-linkage', 'nn_chain_linkage:NnChainLinkage', 
+        {'method': 'complete'}),
+    ('group-average', 
+        'group_average_linkage_optimized:GroupAverageLinkageOptimized'),
+    ('centroid', 'centroid_linkage_optimized:CentroidLinkageOptimized'),
+    ('average', 'nn_chain_linkage:NnChainLinkage', {'method': 'average'}),
+    ('weighted', 'nn_chain_linkage:NnChainLinkage', {'method': 'weighted'}),
+    ('median', 'lance_williams_linkage:LanceWilliamsLinkage', 
+        {'method': 'median'}),
+    ('ward', 'ward_linkage:WardLinkage')])
+
+# distance strategies, imported on first use
+
+distances = Registry([
+    ('euclidean', 'euclidean_distance:EuclideanDistance'),
+    ('quadratic-euclidean', 
+        'quadratic_euclidean_distance:QuadraticEuclideanDistance'),
+    ('manhatten', 'manhatten_distance:ManhattenDistance'),
+    ('maximum', 'maximum_distance:MaximumDistance')])
 
 # \file hclu.py
 # \brief This is the main module containing the Hclu facade.
@@ -64,61 +78,46 @@ class Hclu(object):
        
         # List of clustering runs with additional information.
         self.runs = []
-
-    # \brief This method is used to load data using CSV format.
+        
+        # Optional DistanceCache used by all clustering runs.
+        self.distance_cache = None
+        
+        # Optional path the clustering runs are written to, see 
+        # dendrogram_file. Runs after the first get the suffix .<index>.
+        self.output = None
+
+    # \brief This method is used to load data using CSV format. filename
+    #        may also be the directory of a BinaryDataset. If binary is 
+    #        set, the CSV file is converted into the BinaryDataset 
+    #        filename.hclu once and loaded from there, until it is stale.
     # \author Bjoern Borgmann <bjoern.borgmann@uni-oldenburg.de>
     # \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
     # \pre filename encodes existing file.
     # \post data is loaded.
     # \throw HcluException { throws if loading data failed. }
-    def load_data(self, filename, cluster_indices):
+    def load_data(self, filename, cluster_indices, binary=False):
         """This method is used to load data using CSV format."""
 
         if(not isinstance(filename, str)):
             raise TypeError("filename is not instance of str.")
         
-        data_file = DataFile()
-        data_file.filename = filename
-        
         try:
-            tmp_row = []
-            reader = csv.reader(open(filename, 'rb'), delimiter=',')
-            for datarow in reader:
-                tmp_row.append(datarow)
-
-            data_file.attributes = tmp_row[0]
-
-            indices = Set(range(0, len(tmp_row[0])))
-            ignored_indices = indices - Set(cluster_indices)            
-
-            for i in xrange(1, len(tmp_row)):
-                tmp_data = []               
-
-                is_cluster_index = lambda (idx, val) : idx in cluster_indices
-                is_ignored_index = lambda (idx, val) : idx in ignored_indices
-                strip = lambda (idx, val) : val
-
-                for element in map(strip,
-                    filter(is_cluster_index, enumerate(tmp_row[i]))):                    
-                    tmp_data.append(float(element))    
-                    
-                # Generating and appending Data Element
-                data_file.elements.append(DataElement(
-                    np.array(tmp_data), 
-                    map(strip,filter(is_ignored_index, enumerate(tmp_row[i]))),  
-                    map(strip,filter(is_ignored_index,\
-                        enumerate(data_file.attributes)))))
-
+            if (BinaryDataset.is_dataset(filename)):
+                data_file = BinaryDataset(filename).load(cluster_indices)
+            elif (binary):
+                data_file = BinaryDataset.of(filename).load(
+                    cluster_indices, filename)
+            else:
+                data_file = CsvLoader().load(filename, cluster_indices)
         except Exception:
             traceback.print_exc(file=sys.stdout)
             raise HcluException("load data failed. terminating.")
         
-        data_file.numOfElements = len(tmp_row)-1
         self.data_files.append(data_file)
         
         self.data_loaded = True
         
-        print ("Loaded " + str(len(tmp_row)-1) + " datasets")
+        print ("Loaded " + str(data_file.numOfElements) + " datasets")
         
     # \brief Generate new clustering runs with a given strategy and all loaded
     #        datafiles. 
@@ -148,6 +147,9 @@ class Hclu(object):
         
         # Init Strategy
         init_start_time = datetime.datetime.now()
+        strategy.distance_cache = self.distance_cache
+        strategy.attributes = data_file.cluster_indices
+        strategy.linkage_path = self._output_path()
         strategy.initialize(data_file.elements)
 
         # Run Strategy
@@ -158,7 +160,7 @@ class Hclu(object):
         complete_runtime = end_time - init_start_time
         
         # Save Run Resuls
-        self.runs.append(ClusteringRun(\
+        run = ClusteringRun(\
             data_file.filename,
             strategy.description, 
             strategy.distance_function.description, 
@@ -166,44 +168,135 @@ class Hclu(object):
             run_start_time, 
             end_time,
             complete_runtime,
-            strategy.clustering))
+            strategy.linkage,
+            data_file.elements,
+            data_file.cluster_indices)
+        
+        if (strategy.linkage_path is not None):
+            save_run(run, strategy.linkage_path)
+        
+        self.runs.append(run)
+
+    # \brief Returns the path the next clustering run is written to, None
+    #        if there is no output path.
+    # \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+    def _output_path(self):
+        """Returns the path the next clustering run is written to."""
+
+        if (self.output is None or len(self.runs) == 0):
+            return self.output
+
+        return self.output + '.' + str(len(self.runs))
+
+    # \brief Returns the flat clusterings of the clustering run with given
+    #        index with k clusters or with all merges up to the given 
+    #        height as label arrays.
+    # \see cut#cut
+    # \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+    def cut(self, num_of_clustering_run, k=None, height=None):
+        """Returns the flat clusterings of the clustering run with given
+        index with k clusters or up to the given height."""
+
+        if (num_of_clustering_run >= len(self.runs)):
+            raise HcluException("There are no clustering run with given number!")
+
+        return self.runs[num_of_clustering_run].cut(k, height)
+
+    # \brief Returns the cophenetic correlation of the clustering run with
+    #        given index and the distances of its elements computed by 
+    #        distance_function. Cached distances are read from the 
+    #        memory-mapped cache file, otherwise they are computed and kept
+    #        in memory-mapped files in memmap_directory if given.
+    # \see cophenetic#cophenetic_correlation
+    # \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+    def cophenetic_correlation(self, num_of_clustering_run, 
+        distance_function, memmap_directory=None, jobs=1):
+        """Returns the cophenetic correlation of the clustering run with
+        given index."""
+
+        if (num_of_clustering_run >= len(self.runs)):
+            raise HcluException("There are no clustering run with given number!")
+
+        run = self.runs[num_of_clustering_run]
+
+        # The base strategy provides the cached distance matrix
+        strategy = Strategy(distance_function, memmap_directory, jobs)
+        strategy.distance_cache = self.distance_cache
+        strategy.attributes = run.attributes
+
+        # Only read, so the cache file is used without a copy
+        values = strategy.cached_distances(strategy.data_matrix(run.elements))
+        if (values is not None):
+            return cophenetic_correlation(run.linkage, values)
+
+        matrix = strategy.distance_matrix(run.elements)
+
+        try:
+            return cophenetic_correlation(run.linkage, matrix)
+        finally:
+            if (hasattr(matrix, 'close')):
+                matrix.close()
+
+# \brief Command line interface. Parses argv, by default the arguments of
+#        the process, loads the data file and clusters it.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+def main(argv=None):
+    """Command line interface."""
+
+    parser = argparse.ArgumentParser(prog='hclu', 
+        description='hierachical clustering')
+
+    parser.add_argument('-i',\
+        required=True, help='CSV file with data set to cluster, optionally ' +\
+        'gzip or bzip2 compressed, or a binary dataset directory')
+
+    parser.add_argument('--binary', action='store_true',\
+        help='convert the CSV file once into the binary dataset I.hclu and ' +\
+        'load it from there while it is up to date')
+
+    parser.add_argument('-a',\
+        required=True, help='indices of attributes to cluster e.g. 0,3,2')
+
+    parser.add_argument('-m', required=True, choices=strategies.names())
+    parser.add_argument('-d', required=True, choices=distances.names())
+
+    parser.add_argument('--memmap', metavar='DIR', default=None,\
+        help='keep distance matrices in memory-mapped files in DIR')
 
-# Here starts command line argument parsing
+    parser.add_argument('-j', '--jobs', metavar='N', type=int, default=1,\
+        help='number of processes computing the distances')
 
-hclu = Hclu()
+    parser.add_argument('--cache', metavar='DIR', default=None,\
+        help='reuse distance matrices of previous runs stored in DIR')
 
-parser = argparse.ArgumentParser(prog='hclu', description='hierachical clustering')
+    parser.add_argument('--cache-size', metavar='MB', type=int, default=1024,\
+        help='maximum size of the distance matrix cache in megabytes')
 
-methods = ['single-linkage', 'complete-linkage', 'group-average', 'centroid']
-distances = ['euclidean', 'quadratic-euclidean', 'manhatten', 'maximum']
+    parser.add_argument('-o', metavar='FILE', default=None,\
+        help='write the dendrogram to FILE.npy and the run information to ' +\
+        'FILE.json')
 
-method_strategies = {
-    'single-linkage': SingleLinkageNbm, 
-    'complete-linkage': CompleteLinkageEfficientHAC,
-    'group-average': GroupAverageLinkageOptimized,
-    'centroid': CentroidLinkageOptimized} 
+    parameters = vars(parser.parse_args(argv))
 
-distance_strategies = {
-    'euclidean': EuclideanDistance,
-    'quadratic-euclidean': QuadraticEuclideanDistance,
-    'manhatten': ManhattenDistance,
-    'maximum': MaximumDistance} 
+    logging.basicConfig(level=logging.INFO, 
+        format='%(asctime)s || %(message)s', datefmt='%d.%m.%Y %H:%M:%S')
 
-parser.add_argument('-i',\
-    required=True, help='file with data set to cluster')
+    cluster_indices = map(lambda c : int(c), parameters['a'].split(','))
 
-parser.add_argument('-a',\
-    required=True, help='indices of attributes to cluster e.g. 0,3,2')
+    hclu = Hclu()
 
-parser.add_argument('-m', required=True, choices=methods)
-parser.add_argument('-d', required=True, choices=distances)
+    if (parameters['cache'] is not None):
+        hclu.distance_cache = DistanceCache(parameters['cache'],
+            parameters['cache_size'] * 2 ** 20)
 
-parameters = vars(parser.parse_args())
+    hclu.output = parameters['o']
 
-distance_strategy = distance_strategies.get(parameters['d'])
-method_strategy = method_strategies.get(parameters['m'])
-cluster_indices = map(lambda c : int(c), parameters['a'].split(','))
+    hclu.load_data(parameters['i'], cluster_indices, parameters['binary'])
+    hclu.cluster(strategies.create(parameters['m'], 
+        distances.create(parameters['d']), 
+        parameters['memmap'], parameters['jobs']))
 
-hclu.load_data(parameters['i'], cluster_indices)
-hclu.cluster(method_strategy(distance_strategy()))
+    return hclu
 
+if __name__ == '__main__':
+    main()
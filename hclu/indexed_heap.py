@@ -0,0 +1,211 @@
+"""
+This file is part of hclu.
+
+hclu is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+hclu is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with hclu.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""This module contains the indexed binary heap."""
+
+import numpy as np
+
+from array import array
+
+# \file indexed_heap.py
+# \brief Binary min heap over the integer keys 0..capacity-1 backed by 
+#        compact typed arrays. The position of every key in the heap is 
+#        stored, so that changing the priority of a key (decrease-key and
+#        increase-key) and deleting a key cost O(log n) without stale
+#        entries. Entries are ordered by (priority, key). The interface 
+#        is dict-like: heap[key] = priority, del heap[key], key in heap 
+#        and smallest_item().
+#
+#        The arrays are array.array buffers, which take as much memory as
+#        NumPy arrays but are much faster for the element wise access of 
+#        the sift operations. Building from NumPy arrays is vectorized.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+class IndexedHeap(object):
+    """Binary min heap over integer keys with O(log n) updates."""
+
+    # \brief Initialize an empty heap for the keys 0..capacity-1. If keys
+    #        and priorities are given, the heap is built from them at once
+    #        by sorting, which is a valid heap order.
+    def __init__(self, capacity, keys=None, priorities=None):
+        """Initialize a heap for the keys 0..capacity-1."""
+
+        index_type = np.int32 if capacity < 2 ** 31 else np.int64
+        self.capacity = capacity
+
+        if (keys is None or len(keys) == 0):
+            keys = np.empty(0, dtype=index_type)
+            priorities = np.empty(0, dtype=np.float64)
+        else:
+            keys = np.asarray(keys, dtype=index_type)
+            priorities = np.asarray(priorities, dtype=np.float64)
+
+            order = np.lexsort((keys, priorities))
+            keys = keys[order]
+            priorities = priorities[order]
+
+        # Position of each key in the heap, -1 if not contained
+        positions = np.empty(capacity, dtype=index_type)
+        positions.fill(-1)
+        positions[keys] = np.arange(len(keys))
+
+        code = 'i' if index_type == np.int32 else 'l'
+        self.keys = array(code, keys.tostring())
+        self.priorities = array('d', priorities.tostring())
+        self.positions = array(code, positions.tostring())
+
+    # \brief Returns the pair (key, priority) with the lowest priority.
+    #        Raises IndexError if the heap is empty.
+    def smallest_item(self):
+        """Return the pair (key, priority) with the lowest priority."""
+
+        if (len(self.keys) == 0):
+            raise IndexError("heap is empty")
+
+        return self.keys[0], self.priorities[0]
+
+    # \brief Returns the key with the lowest priority and removes it.
+    def pop_smallest(self):
+        """Return the key with the lowest priority and remove it."""
+
+        key = self.smallest_item()[0]
+        del self[key]
+        return key
+
+    def __setitem__(self, key, priority):
+        position = self.positions[key]
+
+        if (position < 0):
+            # Insert at the end
+            self.keys.append(key)
+            self.priorities.append(priority)
+            position = len(self.keys) - 1
+            self.positions[key] = position
+            self._sift_up(position)
+        else:
+            old = self.priorities[position]
+            self.priorities[position] = priority
+
+            if (priority < old):
+                self._sift_up(position)
+            else:
+                self._sift_down(position)
+
+    def __getitem__(self, key):
+        position = self.positions[key]
+
+        if (position < 0):
+            raise KeyError(key)
+
+        return self.priorities[position]
+
+    def __delitem__(self, key):
+        position = self.positions[key]
+
+        if (position < 0):
+            raise KeyError(key)
+
+        self.positions[key] = -1
+
+        # Move the last entry to the free position
+        last_key = self.keys.pop()
+        last_priority = self.priorities.pop()
+
+        if (position < len(self.keys)):
+            self.keys[position] = last_key
+            self.priorities[position] = last_priority
+            self.positions[last_key] = position
+            self._sift_down(self._sift_up(position))
+
+    def __contains__(self, key):
+        return self.positions[key] >= 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __nonzero__(self):
+        return len(self.keys) > 0
+
+    # \brief Moves the entry at position up while it is ordered before its
+    #        parent. Returns the new position.
+    def _sift_up(self, position):
+        keys = self.keys
+        priorities = self.priorities
+        positions = self.positions
+
+        key = keys[position]
+        priority = priorities[position]
+
+        while (position > 0):
+            parent = (position - 1) >> 1
+            parent_priority = priorities[parent]
+
+            if (parent_priority < priority or (parent_priority == priority
+                and keys[parent] < key)):
+                break
+
+            keys[position] = keys[parent]
+            priorities[position] = parent_priority
+            positions[keys[position]] = position
+            position = parent
+
+        keys[position] = key
+        priorities[position] = priority
+        positions[key] = position
+
+        return position
+
+    # \brief Moves the entry at position down while a child is ordered 
+    #        before it. Returns the new position.
+    def _sift_down(self, position):
+        keys = self.keys
+        priorities = self.priorities
+        positions = self.positions
+        length = len(keys)
+
+        key = keys[position]
+        priority = priorities[position]
+
+        while True:
+            child = 2 * position + 1
+
+            if (child >= length):
+                break
+
+            child_priority = priorities[child]
+            right = child + 1
+
+            if (right < length):
+                right_priority = priorities[right]
+                if (right_priority < child_priority or (right_priority ==
+                    child_priority and keys[right] < keys[child])):
+                    child = right
+                    child_priority = right_priority
+
+            if (priority < child_priority or (priority == child_priority
+                and key < keys[child])):
+                break
+
+            keys[position] = keys[child]
+            priorities[position] = child_priority
+            positions[keys[position]] = position
+            position = child
+
+        keys[position] = key
+        priorities[position] = priority
+        positions[key] = position
+
+        return position
@@ -0,0 +1,217 @@
+"""
+This file is part of hclu.
+
+hclu is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+hclu is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with hclu.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""This module contains the generic Lance-Williams linkage strategy."""
+
+import numpy as np
+
+from euclidean_distance import EuclideanDistance
+from hclu_exception import HcluException
+from strategy import Strategy
+
+# \brief Coefficients (alpha_i, alpha_j, beta, gamma) of the Lance-Williams
+#        update d(k, i+j) = alpha_i d(k, i) + alpha_j d(k, j) 
+#        + beta d(i, j) + gamma |d(k, i) - d(k, j)| for clusters of size 
+#        ni, nj and the array of sizes nk of all other clusters.
+def _single(ni, nj, nk):
+    return 0.5, 0.5, 0.0, -0.5
+
+def _complete(ni, nj, nk):
+    return 0.5, 0.5, 0.0, 0.5
+
+def _average(ni, nj, nk):
+    return ni / (ni + nj), nj / (ni + nj), 0.0, 0.0
+
+def _weighted(ni, nj, nk):
+    return 0.5, 0.5, 0.0, 0.0
+
+def _centroid(ni, nj, nk):
+    n = ni + nj
+    return ni / n, nj / n, -ni * nj / (n * n), 0.0
+
+def _median(ni, nj, nk):
+    return 0.5, 0.5, -0.25, 0.0
+
+def _ward(ni, nj, nk):
+    n = ni + nj + nk
+    return (ni + nk) / n, (nj + nk) / n, -nk / n, 0.0
+
+# \file lance_williams_linkage.py
+# \brief Generic linkage with the Lance-Williams update formula on a 
+#        condensed distance matrix. Each merge updates the row of the 
+#        merged cluster in one vectorized step. The nearest neighbour of
+#        every cluster is cached, only clusters whose nearest neighbour 
+#        was merged are searched again, which makes the run O(N^2) in
+#        typical cases and O(N^3) in the worst case. Centroid, median and
+#        ward work on squared euclidean distances, heights are reported 
+#        unsquared.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+class LanceWilliamsLinkage(Strategy):
+    """Generic linkage with the Lance-Williams update formula"""
+
+    # method: (coefficients, works on squared distances)
+    methods = {
+        'single': (_single, False),
+        'complete': (_complete, False),
+        'average': (_average, False),
+        'weighted': (_weighted, False),
+        'centroid': (_centroid, True),
+        'median': (_median, True),
+        'ward': (_ward, True)}
+
+    # \brief Initialize the strategy with one of the methods.
+    def __init__(self, distance_function, memmap_directory=None, jobs=1,
+        method='average'):
+        """Initialize the strategy with one of the methods."""
+
+        if (method not in self.methods):
+            raise ValueError("unknown method " + str(method))
+
+        super(LanceWilliamsLinkage, self).__init__(
+            distance_function, memmap_directory, jobs)
+
+        self.method = method
+        self.coefficients, self.squared = self.methods[method]
+        self.description = "Lance-Williams Linkage (" + method + ")"
+
+    # \brief initializes the algorithm by computing the distance matrix
+    #        and the nearest neighbour of every element.
+    # \see Strategy#initialize
+    # \throw HcluException { throws if the method works on squared 
+    #        distances and the distance is not euclidean. }
+    def initialize(self, data):
+        """Initializes the algorithm by initializing data"""
+
+        self._check_distance_function()
+
+        super(LanceWilliamsLinkage, self).initialize(data)
+
+        self._initialize_matrix(data)
+
+        # Nearest neighbour and its distance of each cluster
+        self.nn_index = np.zeros(self.num_of_rec, dtype=np.int64)
+        self.nn_dist = np.empty(self.num_of_rec, dtype=np.float64)
+        self.nn_dist.fill(np.inf)
+
+        for i in xrange(self.num_of_rec):
+            self._update_nearest(i)
+
+    # \brief Throws if the method works on squared distances and the
+    #        distance is not euclidean.
+    def _check_distance_function(self):
+        """Throws if the distance function does not fit the method."""
+
+        if (self.squared and 
+            not isinstance(self.distance_function, EuclideanDistance)):
+            raise HcluException(self.method + 
+                " linkage needs the euclidean distance")
+
+    # \brief Computes the distance matrix, squared if the method works on
+    #        squared distances, and the cluster sizes.
+    def _initialize_matrix(self, data):
+        """Computes the distance matrix and the cluster sizes."""
+
+        self.num_of_rec = len(data)
+        self.matrix = self.distance_matrix(data)
+
+        if (self.squared):
+            np.square(self.matrix.values, out=self.matrix.values)
+
+        self.sizes = np.ones(self.num_of_rec, dtype=np.float64)
+        self.active = np.ones(self.num_of_rec, dtype=bool)
+
+        # Row of a deleted cluster
+        self.deleted = np.empty(self.num_of_rec)
+        self.deleted.fill(np.inf)
+
+    # \brief Returns the height of a merge at the matrix distance d.
+    def _height(self, d):
+        """Returns the height of a merge at the matrix distance d."""
+
+        if (self.squared):
+            return float(np.sqrt(d))
+        return float(d)
+
+    # \brief Merges cluster j into cluster i at distance d_ij with the
+    #        Lance-Williams update of row i. Returns the new row i, the
+    #        distances of deleted clusters are infinite.
+    def _merge(self, i, j, d_ij):
+        """Merges cluster j into cluster i, returns the new row i."""
+
+        row_i = self.matrix.row(i)
+        row_j = self.matrix.row(j)
+
+        alpha_i, alpha_j, beta, gamma = self.coefficients(
+            self.sizes[i], self.sizes[j], self.sizes)
+
+        # Rows of deleted clusters are infinite and give nan here,
+        # they are masked below.
+        with np.errstate(invalid='ignore'):
+            merged = alpha_i * row_i + alpha_j * row_j + beta * d_ij
+            if (gamma != 0.0):
+                merged += gamma * np.abs(row_i - row_j)
+
+        # Delete cluster j
+        self.active[j] = False
+        self.sizes[i] += self.sizes[j]
+
+        merged[~self.active] = np.inf
+        merged[i] = np.inf
+        self.matrix.set_row(j, self.deleted)
+        self.matrix.set_row(i, merged)
+
+        return merged
+
+    # \brief Implementation of abstract run method.
+    # \see Strategy#run
+    def run(self):
+        """Implementation of abstract run method"""
+
+        for n in xrange(self.num_of_rec - 1):
+            # Closest pair
+            i = int(np.argmin(self.nn_dist))
+            j = int(self.nn_index[i])
+            d_ij = self.nn_dist[i]
+
+            self.new_level(i, j, self._height(d_ij))
+
+            merged = self._merge(i, j, d_ij)
+            self.nn_dist[j] = np.inf
+
+            # Clusters whose nearest neighbour was merged are searched
+            # again, all others can only get closer to the new cluster.
+            stale = self.active & ((self.nn_index == i) | 
+                (self.nn_index == j))
+            stale[i] = True
+
+            closer = self.active & ~stale & (merged < self.nn_dist)
+            self.nn_dist[closer] = merged[closer]
+            self.nn_index[closer] = i
+
+            for k in np.flatnonzero(stale):
+                self._update_nearest(k)
+
+    # \brief Searches the nearest active neighbour of cluster k.
+    def _update_nearest(self, k):
+        """Searches the nearest active neighbour of cluster k."""
+
+        row = self.matrix.row(k)
+        row[k] = np.inf
+        row[~self.active] = np.inf
+
+        self.nn_index[k] = np.argmin(row)
+        self.nn_dist[k] = row[self.nn_index[k]]
@@ -0,0 +1,147 @@
+"""
+This file is part of hclu.
+
+hclu is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+hclu is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with hclu.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""This module contains the lazy view on the clustering levels."""
+
+import collections
+
+import numpy as np
+
+from cluster import Cluster
+
+# \file level_view.py
+# \brief Read-only sequence of the clustering levels of a linkage matrix.
+#        Level k is the clustering after k merges, a dict mapping the
+#        cluster ids to Cluster objects. Levels are not stored but
+#        materialised on request in O(N) from the creation and merge
+#        level of every cluster id. The Cluster objects are built once
+#        and shared between levels, the most recently requested levels
+#        are cached.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+class LevelView(object):
+    """Lazy sequence of the clustering levels of a linkage matrix."""
+
+    # \brief Initialize the view with the linkage matrix and the
+    #        DataElements of the initial clusters. Keeps up to cache_size
+    #        materialised levels.
+    def __init__(self, linkage, elements, cache_size=4):
+        """Initialize the view with the linkage matrix and the elements."""
+
+        self.linkage = linkage
+        self.elements = elements
+        self.cache_size = cache_size
+
+        n = len(elements)
+        merges = len(linkage)
+        children = linkage[:, :2].astype(np.intp)
+
+        # Cluster id c exists in the levels created_at[c] up to
+        # merged_at[c] - 1
+        self.created_at = np.zeros(n + merges, dtype=np.intp)
+        self.created_at[n:] = np.arange(1, merges + 1)
+        self.merged_at = np.empty(n + merges, dtype=np.intp)
+        self.merged_at.fill(merges + 1)
+        self.merged_at[children[:, 0]] = self.created_at[n:]
+        self.merged_at[children[:, 1]] = self.created_at[n:]
+
+        # Cluster objects by id, built on demand in order of the ids
+        self.clusters = [None] * (n + merges)
+        self.built = 0
+
+        self.cache = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self.linkage) + 1 if len(self.elements) > 0 else 0
+
+    def __iter__(self):
+        for level in xrange(len(self)):
+            yield self[level]
+
+    # \brief Returns level as dict mapping the cluster ids to Cluster
+    #        objects, a slice of levels as list.
+    def __getitem__(self, level):
+        if (isinstance(level, slice)):
+            return [self[i] for i in xrange(*level.indices(len(self)))]
+
+        level = self._level(level)
+
+        if (level in self.cache):
+            result = self.cache.pop(level)
+        else:
+            ids = np.flatnonzero(
+                (self.created_at <= level) & (level < self.merged_at))
+            self._build(ids[-1])
+            result = dict((c, self.clusters[c]) for c in ids.tolist())
+
+        # Most recently requested level last
+        self.cache[level] = result
+        while (len(self.cache) > self.cache_size):
+            self.cache.popitem(last=False)
+
+        return result
+
+    # \brief Returns the cluster id of every element in the given level
+    #        as array. The merges up to the level are replayed on a
+    #        union-find forest over the cluster ids, flattened by pointer
+    #        jumping.
+    def labels(self, level):
+        """Returns the cluster id of every element in the given level."""
+
+        level = self._level(level)
+        n = len(self.elements)
+
+        parent = np.arange(n + level)
+        children = self.linkage[:level, :2].astype(np.intp)
+        parent[children[:, 0]] = np.arange(n, n + level)
+        parent[children[:, 1]] = np.arange(n, n + level)
+
+        while True:
+            grandparent = parent[parent]
+            if (np.array_equal(grandparent, parent)):
+                break
+            parent = grandparent
+
+        return parent[:n]
+
+    # \brief Returns the level as non-negative index, raises IndexError
+    #        if it does not exist.
+    def _level(self, level):
+        if (level < 0):
+            level += len(self)
+
+        if (level < 0 or level >= len(self)):
+            raise IndexError("level out of range")
+
+        return int(level)
+
+    # \brief Builds the Cluster objects of all ids up to the given one.
+    def _build(self, last):
+        n = len(self.elements)
+
+        while (self.built <= last):
+            c = self.built
+
+            if (c < n):
+                self.clusters[c] = Cluster(self.elements[c])
+            else:
+                left, right, height, size = self.linkage[c - n]
+                self.clusters[c] = Cluster(
+                    self.clusters[int(left)],
+                    self.clusters[int(right)],
+                    None if np.isnan(height) else float(height))
+
+            self.built += 1
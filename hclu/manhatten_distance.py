@@ -16,6 +16,7 @@ along with hclu.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import math
+import numpy as np
 
 from numpy import linalg 
 from distance_function import DistanceFunction
@@ -28,8 +29,15 @@ class ManhattenDistance(DistanceFunction):
     description = "Manhatten Distance"
     
     def distance(self, data1, data2):
-        distance = 0
-        for i in range(0, len(data1)):
-            distance += abs(data1[i] - data2[i])
+        return np.sum(np.abs(data1 - data2))
 
-        return distance
+    def cdist(self, X, Y):
+        X = np.asarray(X, dtype=np.float64)
+        Y = np.asarray(Y, dtype=np.float64)
+
+        result = np.empty((len(X), len(Y)), dtype=np.float64)
+        for block in self._blocks(X, Y):
+            result[block] = np.abs(
+                X[block, np.newaxis, :] - Y[np.newaxis, :, :]).sum(axis=2)
+
+        return result
@@ -16,6 +16,7 @@ along with hclu.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import math
+import numpy as np
 
 from numpy import linalg 
 from distance_function import DistanceFunction
@@ -28,8 +29,15 @@ class MaximumDistance(DistanceFunction):
     description = "Maximum Distance"
     
     def distance(self, data1, data2):
-        distances = []
-        for i in range(0, len(data1)):
-            distances.append(abs(data1[i] - data2[i]))
+        return np.max(np.abs(data1 - data2))
 
-        return max(distances)
+    def cdist(self, X, Y):
+        X = np.asarray(X, dtype=np.float64)
+        Y = np.asarray(Y, dtype=np.float64)
+
+        result = np.empty((len(X), len(Y)), dtype=np.float64)
+        for block in self._blocks(X, Y):
+            result[block] = np.abs(
+                X[block, np.newaxis, :] - Y[np.newaxis, :, :]).max(axis=2)
+
+        return result
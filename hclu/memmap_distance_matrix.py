@@ -0,0 +1,87 @@
+"""
+This file is part of hclu.
+
+hclu is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+hclu is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with hclu.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""This module contains the memory-mapped condensed distance matrix."""
+
+import os
+import tempfile
+import numpy as np
+
+from distance_matrix import DistanceMatrix
+
+# \file memmap_distance_matrix.py
+# \brief Condensed distance matrix stored in a memory-mapped file, so that
+#        matrices larger than the main memory are paged in and out by the
+#        operating system. Without filename a temporary file in directory
+#        is used, which is removed by close.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+class MemmapDistanceMatrix(DistanceMatrix):
+    """Condensed distance matrix stored in a memory-mapped file."""
+
+    # \brief Initialize a matrix for size elements backed by the file
+    #        filename or by a temporary file in directory.
+    def __init__(self, size, filename=None, directory=None):
+        """Initialize a matrix for size elements backed by a file."""
+
+        self.temporary = filename is None
+
+        if (self.temporary):
+            handle, filename = tempfile.mkstemp(
+                prefix='hclu-', suffix='.dist', dir=directory)
+            os.close(handle)
+
+        self.filename = filename
+
+        # The mapping is shared with forked processes
+        super(MemmapDistanceMatrix, self).__init__(size, shared=True)
+
+    # \brief Maps the file. Empty matrices can not be mapped and are kept
+    #        in memory.
+    def _allocate(self, length):
+        """Maps the file with length float64 cells."""
+
+        if (length == 0):
+            return np.zeros(0, dtype=np.float64)
+
+        return np.memmap(self.filename, dtype=np.float64, mode='w+',
+            shape=(length,))
+
+    # \brief Writes changed pages back to the file.
+    def flush(self):
+        """Writes changed pages back to the file."""
+
+        if (isinstance(self.values, np.memmap)):
+            self.values.flush()
+
+    # \brief Unmaps the file and removes it if it is temporary.
+    def close(self):
+        """Unmaps the file and removes it if it is temporary."""
+
+        if (self.values is None):
+            return
+
+        self.flush()
+        self.values = None
+
+        if (self.temporary and os.path.exists(self.filename)):
+            os.remove(self.filename)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
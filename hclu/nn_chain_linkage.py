@@ -0,0 +1,111 @@
+"""
+This file is part of hclu.
+
+hclu is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+hclu is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with hclu.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""This module contains the nearest-neighbour-chain linkage strategy."""
+
+import numpy as np
+
+from lance_williams_linkage import LanceWilliamsLinkage
+
+# \file nn_chain_linkage.py
+# \brief Linkage with the nearest-neighbour-chain algorithm for the 
+#        reducible methods single, complete, average, weighted and ward.
+#        The chain follows nearest neighbours until two clusters are
+#        reciprocal nearest neighbours, which are merged with the 
+#        Lance-Williams update. Time complexity O(N^2), space complexity 
+#        one condensed distance matrix. The merges are found out of order
+#        and sorted by height afterwards, which gives the same dendrogram 
+#        as the other strategies.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+class NnChainLinkage(LanceWilliamsLinkage):
+    """Linkage with the nearest-neighbour-chain algorithm"""
+
+    # Only reducible methods, centroid and median are not
+    methods = dict((method, LanceWilliamsLinkage.methods[method])
+        for method in ['single', 'complete', 'average', 'weighted', 'ward'])
+
+    # \brief Initialize the strategy with one of the methods.
+    def __init__(self, distance_function, memmap_directory=None, jobs=1,
+        method='average'):
+        """Initialize the strategy with one of the methods."""
+
+        super(NnChainLinkage, self).__init__(
+            distance_function, memmap_directory, jobs, method)
+
+        self.description = "Nearest-Neighbour-Chain Linkage (" + method + ")"
+
+    # \brief initializes the algorithm by computing the distance matrix.
+    # \see Strategy#initialize
+    def initialize(self, data):
+        """Initializes the algorithm by initializing data"""
+
+        self._check_distance_function()
+
+        # No nearest neighbour cache needed
+        super(LanceWilliamsLinkage, self).initialize(data)
+
+        self._initialize_matrix(data)
+
+    # \brief Implementation of abstract run method.
+    # \see Strategy#run
+    def run(self):
+        """Implementation of abstract run method"""
+
+        merges = max(0, self.num_of_rec - 1)
+        first = np.zeros(merges, dtype=np.int64)
+        second = np.zeros(merges, dtype=np.int64)
+        heights = np.zeros(merges)
+
+        chain = []
+
+        for n in xrange(merges):
+            if (len(chain) == 0):
+                chain.append(int(np.flatnonzero(self.active)[0]))
+
+            # Grow the chain until its last two clusters are reciprocal
+            # nearest neighbours
+            while True:
+                a = chain[-1]
+
+                row = self.matrix.row(a)
+                row[a] = np.inf
+
+                b = int(np.argmin(row))
+
+                # Prefer the predecessor on ties, so the chain terminates
+                if (len(chain) > 1 and row[chain[-2]] <= row[b]):
+                    b = chain[-2]
+
+                if (len(chain) > 1 and b == chain[-2]):
+                    break
+
+                chain.append(b)
+
+            chain.pop()
+            chain.pop()
+
+            # The merged cluster keeps the smaller index
+            i, j = min(a, b), max(a, b)
+            d_ij = row[b]
+
+            first[n] = i
+            second[n] = j
+            heights[n] = self._height(d_ij)
+
+            self._merge(i, j, d_ij)
+
+        self.replay_merges(first, second, heights)
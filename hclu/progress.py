@@ -0,0 +1,105 @@
+"""
+This file is part of hclu.
+
+hclu is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+hclu is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with hclu.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""This module contains the progress observer."""
+
+import datetime
+import logging
+import time
+
+# Logger of hclu, quiet unless the application configures logging
+logger = logging.getLogger('hclu')
+logger.addHandler(logging.NullHandler())
+
+# \file progress.py
+# \brief Observer of the progress of a strategy. A phase is started with
+#        the total number of steps, e.g. merges, and updated with the
+#        number of steps done. Updates are cheap, reports are rate
+#        limited to one per interval seconds and, if steps is set, one
+#        per steps steps. A report contains the phase, the steps done,
+#        the rate and the estimated time left. By default reports are
+#        logged at level INFO, callback replaces the logging.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+class Progress(object):
+    """Rate limited observer of the progress of a strategy."""
+
+    # \brief Initialize the observer. callback is called with phase, done,
+    #        total, rate and eta in seconds instead of logging.
+    def __init__(self, interval=5.0, steps=None, callback=None):
+        """Initialize the observer."""
+
+        self.interval = interval
+        self.steps = steps
+        self.callback = callback
+
+        self.phase = None
+        self.total = 0
+        self.done = 0
+        self.start_time = None
+        self.next_time = None
+        self.next_done = None
+
+    # \brief Starts the given phase with total steps.
+    def start(self, phase, total):
+        """Starts the given phase with total steps."""
+
+        self.phase = phase
+        self.total = total
+        self.done = 0
+        self.start_time = time.time()
+        self._schedule()
+
+    # \brief Sets the number of steps done, reports if due.
+    def update(self, done):
+        """Sets the number of steps done, reports if due."""
+
+        self.done = done
+
+        if (done >= self.next_done or time.time() >= self.next_time):
+            self.report()
+            self._schedule()
+
+    # \brief Reports the end of the phase.
+    def finish(self):
+        """Reports the end of the phase."""
+
+        self.report()
+
+    # \brief Reports the current state of the phase.
+    def report(self):
+        """Reports the current state of the phase."""
+
+        seconds = max(time.time() - self.start_time, 1e-6)
+        rate = self.done / seconds
+        eta = (self.total - self.done) / rate if rate > 0 else None
+
+        if (self.callback is not None):
+            self.callback(self.phase, self.done, self.total, rate, eta)
+        else:
+            logger.info("%s: %d of %d, %.0f/s, %s left", self.phase,
+                self.done, self.total, rate,
+                'unknown' if eta is None else
+                    datetime.timedelta(seconds=int(eta)))
+
+    # \brief Sets the time and the steps of the next report.
+    def _schedule(self):
+        self.next_time = time.time() + self.interval
+
+        if (self.steps is None):
+            self.next_done = float('inf')
+        else:
+            self.next_done = self.done + self.steps
@@ -29,3 +29,6 @@ class QuadraticEuclideanDistance(DistanceFunction):
     
     def distance(self, data1, data2):
         return linalg.norm(data1-data2)**2
+
+    def cdist(self, X, Y):
+        return self._squared_euclidean(X, Y)
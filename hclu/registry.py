@@ -0,0 +1,93 @@
+"""
+This file is part of hclu.
+
+hclu is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+hclu is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with hclu.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""This module contains the registry of strategies by name."""
+
+import functools
+
+from hclu_exception import HcluException
+
+# \file registry.py
+# \brief Maps names to classes given as 'module:Class' strings, with
+#        optional keyword arguments bound to the class. A module is only
+#        imported when one of its names is requested for the first time.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+class Registry(object):
+    """Maps names to lazily imported classes."""
+
+    # \brief Initialize the registry with a list of (name, path) or
+    #        (name, path, keyword arguments) entries.
+    def __init__(self, entries=()):
+        """Initialize the registry with the given entries."""
+
+        self.entries = []
+        self.paths = {}
+        self.factories = {}
+
+        for entry in entries:
+            self.register(*entry)
+
+    # \brief Registers the class path 'module:Class' under name. The
+    #        keyword arguments are passed to the class on creation.
+    def register(self, name, path, kwargs=None):
+        """Registers the class path 'module:Class' under name."""
+
+        if (name not in self.paths):
+            self.entries.append(name)
+
+        self.paths[name] = (path, kwargs or {})
+        self.factories.pop(name, None)
+
+    # \brief Returns the registered names in order of registration.
+    def names(self):
+        """Returns the registered names."""
+
+        return list(self.entries)
+
+    # \brief Returns the factory of name, the class or the class with
+    #        bound keyword arguments. Imports its module on first use.
+    # \throw HcluException { throws if the name is not registered. }
+    def get(self, name):
+        """Returns the factory of name."""
+
+        if (name not in self.factories):
+            if (name not in self.paths):
+                raise HcluException("unknown name " + str(name))
+
+            path, kwargs = self.paths[name]
+            module_name, class_name = path.split(':')
+
+            # Relative to this package like the imports of the modules
+            module = __import__(module_name, globals(), {}, [class_name], -1)
+            factory = getattr(module, class_name)
+
+            if (kwargs):
+                factory = functools.partial(factory, **kwargs)
+
+            self.factories[name] = factory
+
+        return self.factories[name]
+
+    # \brief Returns a new instance of name created with the given
+    #        arguments.
+    def create(self, name, *args, **kwargs):
+        """Returns a new instance of name."""
+
+        return self.get(name)(*args, **kwargs)
+
+    def __contains__(self, name):
+        return name in self.paths
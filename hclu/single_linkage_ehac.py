@@ -17,8 +17,11 @@ along with hclu.  If not, see <http://www.gnu.org/licenses/>.
 
 """This module contains single linkage with efficient HAC algorithm"""
 
+import numpy
+
 from strategy import Strategy
-from priority_dict import PriorityDict
+from indexed_heap import IndexedHeap
+from tournament_tree import TournamentTree
 
 # \file single_linkage_ehac.py
 # \brief Single Linkage with EfficentHAC algorithm, 
@@ -54,31 +57,32 @@ class SingleLinkageEfficientHAC(Strategy):
         # titled 'P' in pseudo code
         self.priority_queues = []
 
-        # simialarity matrix (titled 'C' in pseudo code)
-        self.simialarities = [[CRecord() for j in xrange(0, self.data_length)]
-            for k in xrange(0, self.data_length)]
+        # simialarity matrix (titled 'C' in pseudo code), condensed
+        # upper triangular matrix.
+        self.simialarities = self.distance_matrix(self.data)
 
         # time complexity O(N^2) because N^2 + O(N * log N) where N = len(data)
-        # space complexity self.simialarities N^2 and self.priority_queues N^2
+        # space complexity self.simialarities N^2/2 and 
+        # self.priority_queues N^2, stored in compact arrays
         for n in xrange(0, self.data_length):
-            for i in xrange(0, self.data_length):
+            self.not_merged[n] = 1
 
-                self.simialarities[n][i].sim = \
-                    self.distance_function.distance(
-                        self.data[n].data,
-                        self.data[i].data)
-                
-                self.simialarities[n][i].index = i
-                self.not_merged[n] = 1
-      
-            self.priority_queues.append(PriorityDict())
+            others = numpy.arange(self.data_length) != n
+            self.priority_queues.append(IndexedHeap(self.data_length,
+                numpy.flatnonzero(others), 
+                self.simialarities.row(n)[others]))
 
-            for i in xrange(0, self.data_length):
-                if(i != n):
-                    self.priority_queues[n][i] = self.simialarities[n][i]
+        # global index over the smallest entries of all priority queues
+        # and the keys of these entries
+        self.heads = TournamentTree(self.data_length)
+        self.head_keys = [None] * self.data_length
+        for n in xrange(0, self.data_length):
+            self._update_head(n)
         
     # \brief Implementation of abstract run method, time complexity
-    #        O(N^2 * log N), space complexity 0.
+    #        O(N^2 * log N), space complexity 0. The best pair is taken
+    #        from the global index in O(1), the index is updated in 
+    #        O(log N) for each row whose head changed.
     #
     # \see Strategy#run
     # \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
@@ -90,34 +94,23 @@ class SingleLinkageEfficientHAC(Strategy):
         # space complexity 0
         for k in xrange(0, self.data_length - 1):
             
-            # arg max (k: I[k]=1)
-            firstRun = True
-
-            # time complexity O(N) where N is amount of clusters
-            # space complexity 0
-            for z in xrange(0, self.data_length):
-                if self.not_merged[z] != 1: 
-                    continue
-    
-                smallest = self.priority_queues[z].smallest()              
-                simularity = smallest.sim
-                index = smallest.index 
-
-                if firstRun: 
-                    k1 = z
-                    minimum = simularity 
-                    minimum_index = index
-                    firstRun = False
-                if minimum > simularity:
-                    k1 = z
-                    minimum = simularity
-                    minimum_index = index
+            # arg max (k: I[k]=1), time complexity O(1) using the 
+            # global index over the heads of the priority queues
+            k1 = self.heads.smallest_item()[0]
+            minimum_index, minimum = self.priority_queues[k1].smallest_item()
 
             k2 = minimum_index
  
             self.new_level(k1, k2, minimum)
             self.not_merged[k2] = 0
-            self.priority_queues[k1] = PriorityDict()
+            del self.heads[k2]
+
+            # Minimum of the rows of both merged clusters
+            merged = numpy.minimum(
+                self.simialarities.row(k1), 
+                self.simialarities.row(k2))
+            self.simialarities.set_row(k1, merged)
+            keys = []
 
             # time complexity O(N * log N) where N is amount of clusters
             # space complexity 0
@@ -125,29 +118,32 @@ class SingleLinkageEfficientHAC(Strategy):
 
                 if self.not_merged[i] == 1 and i != k1:
 
-                    del self.priority_queues[i][k2]                                                        
-                    self.simialarities[i][k1].sim = min(\
-                        self.simialarities[i][k1].sim, 
-                        self.simialarities[i][k2].sim)
-
-                    self.priority_queues[i][k1] = self.simialarities[i][k1]
-
-                    self.simialarities[k1][i].sim = min(\
-                        self.simialarities[k1][i].sim, 
-                        self.simialarities[k2][i].sim)
-
-                    self.priority_queues[k1][i] = self.simialarities[k1][i]
-
-class CRecord:
-    
-    def __init__(self):
-        self.sim = None
-        self.index = None
-
-    def __lt__(self, other):
-        if(not isinstance(other, CRecord)):
-            raise TypeError("not a CRecord")            
-        return self.sim < other.sim
-
-    def __repr__(self):
-        return str(self.sim) + " " + str(self.index)
+                    keys.append(i)
+
+                    del self.priority_queues[i][k2]
+                    self.priority_queues[i][k1] = merged[i]
+
+                    # update the global index only if the head changed
+                    if self.head_keys[i] == k1 or self.head_keys[i] == k2:
+                        self._update_head(i)
+                    elif ((merged[i], k1) < 
+                        (self.heads[i], self.head_keys[i])):
+                        self.heads[i] = merged[i]
+                        self.head_keys[i] = k1
+
+            # the queue of the merged cluster is built at once
+            self.priority_queues[k1] = IndexedHeap(
+                self.data_length, keys, merged[keys])
+            self._update_head(k1)
+
+    # \brief Sets the entry of cluster i in the global index to the 
+    #        smallest entry of its priority queue.
+    def _update_head(self, i):
+        """Updates the entry of cluster i in the global index"""
+
+        if self.priority_queues[i]:
+            self.head_keys[i], self.heads[i] = \
+                self.priority_queues[i].smallest_item()
+        else:
+            self.head_keys[i] = None
+            del self.heads[i]
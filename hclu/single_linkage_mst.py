@@ -0,0 +1,86 @@
+"""
+This file is part of hclu.
+
+hclu is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+hclu is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with hclu.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""This module contains single linkage using a minimum spanning tree"""
+
+import numpy as np
+
+from strategy import Strategy
+
+# \file single_linkage_mst.py
+# \brief Single Linkage derived from a minimum spanning tree, which is
+#        built by Prim's algorithm. The distances of the element added 
+#        last to all others are computed on the fly, no distance matrix is
+#        stored. Time complexity O(N^2), space complexity O(N).
+#        The merges are the edges of the tree in ascending order.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+class SingleLinkageMst(Strategy):
+    """Single Linkage using a minimum spanning tree"""
+
+    description = "Single Linkage with Minimum Spanning Tree"
+
+    # \brief initializes the algorithm by building the minimum spanning
+    #        tree.
+    # \see Strategy#initialize
+    def initialize(self, data):
+        """Initializes the algorithm by building the minimum spanning tree"""
+
+        super(SingleLinkageMst, self).initialize(data)
+
+        self.num_of_rec = len(data)
+        data_matrix = self.data_matrix(data)
+
+        # Edges (parent, child, distance) of the tree
+        self.edge_from = np.zeros(max(0, self.num_of_rec - 1), dtype=np.int64)
+        self.edge_to = np.zeros(max(0, self.num_of_rec - 1), dtype=np.int64)
+        self.edge_dist = np.zeros(max(0, self.num_of_rec - 1))
+
+        if (self.num_of_rec < 2):
+            return
+
+        # Distance of each element to the tree and its closest tree element
+        tree_dist = np.empty(self.num_of_rec)
+        tree_dist.fill(np.inf)
+        parent = np.zeros(self.num_of_rec, dtype=np.int64)
+        in_tree = np.zeros(self.num_of_rec, dtype=bool)
+
+        current = 0
+        for n in xrange(self.num_of_rec - 1):
+            in_tree[current] = True
+            tree_dist[current] = np.inf
+
+            distances = self.distance_function.cdist(
+                data_matrix[current:current + 1], data_matrix)[0]
+
+            closer = ~in_tree & (distances < tree_dist)
+            tree_dist[closer] = distances[closer]
+            parent[closer] = current
+
+            # Elements in the tree stay at infinity
+            current = int(np.argmin(tree_dist))
+
+            self.edge_from[n] = parent[current]
+            self.edge_to[n] = current
+            self.edge_dist[n] = tree_dist[current]
+
+    # \brief Implementation of abstract run method, merges the clusters 
+    #        along the edges of the tree in ascending order.
+    # \see Strategy#run
+    def run(self):
+        """Implementation of abstract run method"""
+
+        self.replay_merges(self.edge_from, self.edge_to, self.edge_dist)
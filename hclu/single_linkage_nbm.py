@@ -15,7 +15,8 @@ You should have received a copy of the GNU General Public License
 along with hclu.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from c_record import CRecord
+import numpy as np
+
 from strategy import Strategy
 
 # \file single_linkage_nbm.py
@@ -29,7 +30,8 @@ class SingleLinkageNbm(Strategy):
     #nOfRec = 0
     #cArray = []
     #iArray = []
-    #nbmArray = []
+    #nbmIndex = []
+    #nbmSim = []
     #aArray = []
     
     # Debug Switch
@@ -57,40 +59,31 @@ class SingleLinkageNbm(Strategy):
             print "    - Creating Datastructures. Counting Data Elements"
         
         self.nOfRec = len(data)
-        self.cArray = [[CRecord() for j in xrange(self.nOfRec)]for k in xrange(self.nOfRec)]
         
-        # Calculating cArray the optimized Way
+        # Calculating cArray as condensed distance matrix
         if (self.message):
             print "    - Calculating cArray"
         
-        for n in xrange(self.nOfRec):
-            for i in xrange(n+1):
-                sim = self.distance_function.distance(data[n].data, data[i].data)
-                self.cArray[n][i].sim = sim
-                self.cArray[n][i].index = i
-                
-                self.cArray[i][n].sim = sim
-                self.cArray[i][n].index = n
-        
-        #print self.cArray
+        self.cArray = self.distance_matrix(data)
             
         # Filling the ohter Arrays
         if (self.message):
             print "    - Filling iArray and nbmArray"
         
-        self.iArray =  []
-        self.nbmArray = []
+        self.iArray = np.arange(self.nOfRec)
+        self.aArray = np.ones(self.nOfRec, dtype=bool)
+        self.nbmIndex = np.zeros(self.nOfRec, dtype=np.intp)
+        self.nbmSim = np.empty(self.nOfRec, dtype=np.float64)
         for n in xrange(self.nOfRec):
-            self.iArray.append(n)
-            self.nbmArray.append(self._get_Best_Match(n, False))
+            self._update_Best_Match(n)
         
         if (self.debug):
             for i in xrange(self.nOfRec):
                 for j in xrange(self.nOfRec):
-                    print (i,j,self.cArray[i][j].sim)
+                    if (i != j): print (i,j,self.cArray[i, j])
             
             for i in xrange(self.nOfRec):
-                print(i, self.nbmArray[i].index, self.nbmArray[i].sim)
+                print(i, self.nbmIndex[i], self.nbmSim[i])
         
         
     # \brief Run the Alogrithm
@@ -106,50 +99,36 @@ class SingleLinkageNbm(Strategy):
             elif (self.message and self.printLevel != None and n%self.printLevel==0):
                 print ("    - Level "+str(n))
             
-            # Search for next Element pair
-            bestRec = None
-            best = None
-            for i in xrange(len(self.nbmArray)):
-                if self.iArray[i]==i and (
-                    bestRec == None or bestRec.sim > self.nbmArray[i].sim
-                ): 
-                    if (self.debug):
-                        if (bestRec != None): 
-                            print (i, bestRec.sim, self.nbmArray[i].sim)
-                        else: 
-                            print (i, None, self.nbmArray[i].sim)
-                        
-                    best = i
-                    bestRec = self.nbmArray[i]
+            # Search for next Element pair, the first active cluster 
+            # with the smallest Best Match
+            sims = np.where(self.aArray, self.nbmSim, np.inf)
+            best = int(np.argmin(sims))
                 
             i1 = best
-            i2 = self.iArray[bestRec.index]
+            i2 = int(self.iArray[self.nbmIndex[best]])
             
             # Append new Clustering level
-            self.new_level(i1, i2, bestRec.sim)
-            #self.aArray.append((i1,i2))
+            self.new_level(i1, i2, float(sims[best]))
             
-            # Update Arrays
-            for i in xrange(self.nOfRec):
-                if self.iArray[i] == i and i != i1 and i != i2:
-                    if (self.cArray[i1][i].sim <= self.cArray[i2][i].sim): 
-                        newSim = self.cArray[i1][i].sim
-                    else: newSim = self.cArray[i2][i].sim
-                    self.cArray[i1][i].sim = newSim
-                    self.cArray[i][i1].sim = newSim
-                if self.iArray[i] == i2: self.iArray[i] = i1
+            # Update Arrays, the entries of inactive clusters are
+            # never read
+            row = np.minimum(self.cArray.row(i1), self.cArray.row(i2))
+            self.cArray.set_row(i1, row)
+            self.aArray[i2] = False
+            self.iArray[self.iArray == i2] = i1
             
-            self.nbmArray[i1] = self._get_Best_Match(i1, True)
+            self._update_Best_Match(i1, row)
              
             
-    # \brief Get Best Match Record for the Record with given index
+    # \brief Set the Best Match of the Record with given index to the
+    #        first active Record with the smallest distance. The row of
+    #        the Record is read from the cArray if not given.
     # \author Bjoern Borgmann <bjoern.borgmann@uni-oldenburg.de>
-    def _get_Best_Match(self, index, checkIArray):
-        bestRec = None
-        for i in xrange(len(self.cArray[index])):
-            # Not the Same Element
-            if (i != index):
-                if (bestRec == None or bestRec.sim > self.cArray[index][i].sim):
-                    if (checkIArray == False or self.iArray[i]==i): 
-                        bestRec = self.cArray[index][i]
-        return bestRec
+    def _update_Best_Match(self, index, row=None):
+        if (row is None):
+            row = self.cArray.row(index)
+        row = np.where(self.aArray, row, np.inf)
+        row[index] = np.inf
+        best = np.argmin(row)
+        self.nbmIndex[index] = best
+        self.nbmSim[index] = row[best]
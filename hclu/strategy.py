@@ -17,11 +17,14 @@ along with hclu.  If not, see <http://www.gnu.org/licenses/>.
 
 """This module contains the abstract clustering strategy class."""
 
-import datetime
+import numpy as np
 
+import dendrogram_file
 from distance_function import DistanceFunction
 from hclu_exception import HcluException
-from cluster import Cluster
+from distance_matrix import DistanceMatrix
+from memmap_distance_matrix import MemmapDistanceMatrix
+from progress import Progress, logger
 
 # \file strategy.py
 # \brief This class is a strategy base class for clustering methods.
@@ -30,9 +33,7 @@ from cluster import Cluster
 class Strategy(object):
     """This class is a strategy base class for clustering methods."""        
 
-    print_mod = 1
-
-    def __init__(self, distance_function):
+    def __init__(self, distance_function, memmap_directory=None, jobs=1):
         if (not isinstance(distance_function, DistanceFunction)):
             raise TypeError(\
             "distance_function is not a DistanceFunction Object")
@@ -40,11 +41,28 @@ class Strategy(object):
         # Distance Function
         self.distance_function = distance_function
         
-        # List for Cluster History
-        self.clustering = []
+        # Directory for memory-mapped distance matrices, None keeps 
+        # them in memory
+        self.memmap_directory = memmap_directory
+        
+        # Number of processes computing the distances
+        self.jobs = jobs
+        
+        # Optional DistanceCache and indices of the clustered attributes,
+        # which are part of the cache key
+        self.distance_cache = None
+        self.attributes = None
+        
+        # Linkage matrix of the merges, see initialize. If linkage_path
+        # is set, the merges are written to this file as they happen.
+        self.linkage = None
+        self.linkage_path = None
         
         # Level Counter
         self.level_counter = 0
+        
+        # Observer of the merges, see Progress
+        self.progress = Progress()
     
     # \brief Implementation of base functions for init algorithm. 
     #        Generating the Cluster Objects
@@ -56,61 +74,166 @@ class Strategy(object):
 
         self.print_message("Initializing "+self.description)
         
-        # Reset List for Cluster History
-        self.clustering = []
+        # Linkage matrix in the convention of SciPy: row k describes
+        # merge k by the ids of the merged clusters (the smaller first), 
+        # the height and the size of the new cluster. Cluster ids below 
+        # len(data) are the initial clusters, merge k creates the id 
+        # len(data) + k.
+        merges = max(len(data) - 1, 0)
+        if (self.linkage_path is not None):
+            self.linkage = dendrogram_file.open_linkage(
+                self.linkage_path, merges)
+        else:
+            self.linkage = np.zeros((merges, 4), dtype=np.float64)
+        
+        # Current cluster id and size of each representative index
+        self.cluster_ids = np.arange(len(data))
+        self.cluster_sizes = np.ones(len(data), dtype=np.intp)
         
         # Reset Level Counter
         self.level_counter = 0
-        
-        # Level 0 cluster list
-        level_0 = {}
-        
-        # Generating Cluster Objects
-        for i in xrange(len(data)):
-            level_0[i] = Cluster(data[i])
-        
-        # Save level 0
-        self.clustering.append(level_0)
     
-    # \brief Generate new clustering level by merging given indices
+    # \brief Returns the data of the given DataElements as new matrix,
+    #        one row per DataElement.
+    def data_matrix(self, data):
+        """Returns the data of the given DataElements as one matrix."""
+
+        if (len(data) == 0):
+            return np.empty((0, 0), dtype=np.float64)
+
+        # Elements of one DataFile are rows of one matrix
+        matrix = data[0].matrix
+        if (all(element.matrix is matrix for element in data)):
+            indices = np.fromiter((element.index for element in data), 
+                dtype=np.intp, count=len(data))
+            return np.ascontiguousarray(matrix.take(indices, axis=0), 
+                dtype=np.float64)
+
+        return np.vstack([element.data for element in data]).astype(
+            np.float64)
+
+    # \brief Returns a new condensed DistanceMatrix for size elements. The
+    #        matrix is memory-mapped if memmap_directory is set. If values
+    #        is given, it is copied into the matrix.
+    def new_distance_matrix(self, size, values=None):
+        """Returns a new condensed DistanceMatrix for size elements."""
+
+        if (self.memmap_directory is not None):
+            matrix = MemmapDistanceMatrix(size, 
+                directory=self.memmap_directory)
+        else:
+            matrix = DistanceMatrix(size, shared=self.jobs > 1)
+
+        if (values is not None):
+            matrix.values[:] = values
+
+        return matrix
+
+    # \brief Returns the condensed distances between the rows of 
+    #        data_matrix from the distance cache as read-only memory-mapped
+    #        array, None if there is no cache or they are not cached.
+    def cached_distances(self, data_matrix):
+        """Returns the cached condensed distances of data_matrix or None."""
+
+        if (self.distance_cache is None):
+            return None
+
+        key = self.distance_cache.key(
+            data_matrix, self.distance_function, self.attributes)
+        values = self.distance_cache.load(key)
+
+        if (values is None or 
+            len(values) != len(data_matrix) * (len(data_matrix) - 1) // 2):
+            return None
+
+        return values
+
+    # \brief Returns a condensed DistanceMatrix with the distances between
+    #        all given DataElements. The matrix is filled blockwise or
+    #        copied from the distance cache if there is one.
+    def distance_matrix(self, data):
+        """Returns a condensed DistanceMatrix of the given DataElements."""
+
+        data_matrix = self.data_matrix(data)
+
+        values = self.cached_distances(data_matrix)
+        if (values is not None):
+            self.print_message("Using cached distances")
+            return self.new_distance_matrix(len(data), values)
+
+        matrix = self.new_distance_matrix(len(data))
+        matrix.fill(data_matrix, self.distance_function, self.jobs)
+
+        if (self.distance_cache is not None):
+            key = self.distance_cache.key(
+                data_matrix, self.distance_function, self.attributes)
+            self.distance_cache.store(key, matrix.values)
+
+        return matrix
+
+    # \brief Generate new clustering level by merging given indices. The
+    #        merge is appended to the linkage matrix.
     # \author Bjoern Borgmann <bjoern.borgmann@uni-oldenburg.de>
     # \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
     def new_level(self, index1, index2, sim=None):
         """Generate new clustering level by merging given indices"""
         #print (index1,index2,sim)
         
-        # Status Message and counter
+        # Progress and counter
         if (self.level_counter == 0):
-            self.print_message("First Merge")
+            self.progress.start("Merging", len(self.linkage))
             
         self.level_counter += 1
+        self.progress.update(self.level_counter)
         
-        if (self.level_counter % self.print_mod == 0):
-            self.print_message("Level " +\
-                str(self.level_counter) +\
-                ": Merging "+str(index1)+\
-                " with " + str(index2) +\
-                " Sim is "+str(sim))
-        
-        # Copy latest level
-        level = self.clustering[len(self.clustering) - 1].copy()
-        
-        # Generating and storing new cluster object. Delete old Object        
-        level[index1] = Cluster(level[index1], level[index2], sim)
-        del level[index2]
-        
-        # Save new level
-        self.clustering.append(level)
-        
-    # \brief Prints given message with timestamp
+        # Record the merge, the merged cluster keeps index1
+        id1 = self.cluster_ids[index1]
+        id2 = self.cluster_ids[index2]
+        size = self.cluster_sizes[index1] + self.cluster_sizes[index2]
+
+        self.linkage[self.level_counter - 1] = (min(id1, id2), 
+            max(id1, id2), np.nan if sim is None else sim, size)
+
+        self.cluster_ids[index1] = len(self.cluster_ids) + \
+            self.level_counter - 1
+        self.cluster_sizes[index1] = size
+
+        if (self.level_counter == len(self.linkage)):
+            self.progress.finish()
+        
+    # \brief Generates the clustering levels of merges, which were found in
+    #        an order different from their heights. Merge k joins the 
+    #        clusters containing the elements first[k] and second[k] at 
+    #        heights[k]. The merges are applied in ascending order of 
+    #        height, merges of equal height keep their order.
+    def replay_merges(self, first, second, heights):
+        """Generates the clustering levels of merges in ascending order."""
+
+        # Union-find over the elements, the root of a set is the 
+        # representative index of its cluster
+        parent = range(len(self.cluster_ids))
+
+        def find(i):
+            while (parent[i] != i):
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for k in np.argsort(heights, kind='mergesort'):
+            i1 = find(int(first[k]))
+            i2 = find(int(second[k]))
+
+            if (i1 > i2):
+                i1, i2 = i2, i1
+
+            self.new_level(i1, i2, float(heights[k]))
+            parent[i2] = i1
+
+    # \brief Logs given message at level INFO to the logger of hclu
     # \autohr Bjoern Borgmann <bjoern.borgmann@gmx.de>
     def print_message(self, msg):
-        """Prints given message with timestamp"""
-        d = datetime.datetime.now()
-        
-        timestring = d.strftime("%d.%m.%Y %H:%M:%S")
-        
-        print (timestring+" || "+msg)
+        """Logs given message to the logger of hclu"""
+        logger.info(msg)
         
     # \brief Abstract method, for running the clustering strategy.
     # \author Bjoern Borgmann <bjoern.borgmann@uni-oldenburg.de>
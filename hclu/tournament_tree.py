@@ -0,0 +1,85 @@
+"""
+This file is part of hclu.
+
+hclu is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+hclu is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with hclu.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""This module contains the tournament tree."""
+
+# \file tournament_tree.py
+# \brief Tournament tree over a fixed number of slots 0..size-1, each with
+#        a value. Every inner node stores the slot with the smaller value
+#        of its children, the root the slot with the smallest value. On 
+#        ties the smaller slot wins. Updating a value costs O(log N), 
+#        finding the smallest value O(1). Empty slots have the value 
+#        infinity.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+class TournamentTree(object):
+    """Tournament tree returning the slot with the smallest value."""
+
+    # \brief Initialize the tree with size slots and optionally their 
+    #        values, building it in O(N).
+    def __init__(self, size, values=None):
+        """Initialize the tree with size slots."""
+
+        self.size = size
+
+        self.capacity = 1
+        while (self.capacity < size):
+            self.capacity *= 2
+
+        self.values = [float('inf')] * self.capacity
+        if (values is not None):
+            self.values[:size] = values
+
+        # tree[capacity + i] is the leaf of slot i
+        self.tree = [0] * self.capacity + range(self.capacity)
+
+        for node in xrange(self.capacity - 1, 0, -1):
+            self.tree[node] = self._winner(node)
+
+    # \brief Returns the winning slot of the children of node.
+    def _winner(self, node):
+        left = self.tree[2 * node]
+        right = self.tree[2 * node + 1]
+
+        if (self.values[right] < self.values[left]):
+            return right
+        return left
+
+    # \brief Sets the value of slot and replays its path to the root.
+    def __setitem__(self, slot, value):
+        self.values[slot] = value
+
+        node = (self.capacity + slot) // 2
+        while (node > 0):
+            self.tree[node] = self._winner(node)
+            node //= 2
+
+    def __getitem__(self, slot):
+        return self.values[slot]
+
+    # \brief Removes slot by setting its value to infinity.
+    def __delitem__(self, slot):
+        self[slot] = float('inf')
+
+    # \brief Returns the pair (slot, value) with the smallest value.
+    def smallest_item(self):
+        """Returns the pair (slot, value) with the smallest value."""
+
+        slot = self.tree[1]
+        return slot, self.values[slot]
+
+    def __len__(self):
+        return self.size
@@ -0,0 +1,126 @@
+"""
+This file is part of hclu.
+
+hclu is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+hclu is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with hclu.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""This module contains the ward linkage strategy."""
+
+import numpy as np
+
+from euclidean_distance import EuclideanDistance
+from hclu_exception import HcluException
+from strategy import Strategy
+
+# \file ward_linkage.py
+# \brief Ward Linkage with the nearest-neighbour-chain algorithm on 
+#        cluster centroids. Each cluster is represented by its centroid 
+#        vector and size, a merge updates them in O(d). The ward distance
+#        sqrt(2 * na * nb / (na + nb)) * |ca - cb| of a cluster to all 
+#        others is computed in one vectorized step, no distance matrix is 
+#        stored. Time complexity O(N^2 * d), space complexity O(N * d).
+#        Only defined for the euclidean distance.
+# \author Jendrik Poloczek <jendrik.poloczek@uni-oldenburg.de>
+class WardLinkage(Strategy):
+    """Ward Linkage with the nearest-neighbour-chain algorithm"""
+
+    description = "Ward Linkage with Nearest-Neighbour-Chain on Centroids"
+
+    # \brief initializes the algorithm by initializing the centroids.
+    # \see Strategy#initialize
+    # \throw HcluException { throws if the distance is not euclidean. }
+    def initialize(self, data):
+        """Initializes the algorithm by initializing data"""
+
+        if (not isinstance(self.distance_function, EuclideanDistance)):
+            raise HcluException("ward linkage needs the euclidean distance")
+
+        super(WardLinkage, self).initialize(data)
+
+        self.num_of_rec = len(data)
+
+        # Centroid vector and size of each cluster
+        self.centroids = self.data_matrix(data)
+        self.sizes = np.ones(self.num_of_rec, dtype=np.float64)
+        self.active = np.ones(self.num_of_rec, dtype=bool)
+
+    # \brief Returns the squared ward distances of cluster a to all 
+    #        clusters, infinite for a itself and merged clusters.
+    def _distances(self, a):
+        """Returns the squared ward distances of cluster a."""
+
+        distances = self.distance_function.cdist(
+            self.centroids[a:a + 1], self.centroids)[0]
+
+        distances *= distances
+        distances *= 2.0 * self.sizes[a] * self.sizes / \
+            (self.sizes[a] + self.sizes)
+
+        distances[~self.active] = np.inf
+        distances[a] = np.inf
+
+        return distances
+
+    # \brief Implementation of abstract run method.
+    # \see Strategy#run
+    def run(self):
+        """Implementation of abstract run method"""
+
+        merges = max(0, self.num_of_rec - 1)
+        first = np.zeros(merges, dtype=np.int64)
+        second = np.zeros(merges, dtype=np.int64)
+        heights = np.zeros(merges)
+
+        chain = []
+
+        for n in xrange(merges):
+            if (len(chain) == 0):
+                chain.append(int(np.flatnonzero(self.active)[0]))
+
+            # Grow the chain until its last two clusters are reciprocal
+            # nearest neighbours
+            while True:
+                a = chain[-1]
+                distances = self._distances(a)
+
+                b = int(np.argmin(distances))
+
+                # Prefer the predecessor on ties, so the chain terminates
+                if (len(chain) > 1 and 
+                    distances[chain[-2]] <= distances[b]):
+                    b = chain[-2]
+
+                if (len(chain) > 1 and b == chain[-2]):
+                    break
+
+                chain.append(b)
+
+            chain.pop()
+            chain.pop()
+
+            # The merged cluster keeps the smaller index
+            i, j = min(a, b), max(a, b)
+
+            first[n] = i
+            second[n] = j
+            heights[n] = np.sqrt(distances[b])
+
+            # Update centroid and size in O(d)
+            size = self.sizes[i] + self.sizes[j]
+            self.centroids[i] = (self.sizes[i] * self.centroids[i] + 
+                self.sizes[j] * self.centroids[j]) / size
+            self.sizes[i] = size
+            self.active[j] = False
+
+        self.replay_merges(first, second, heights)